@@ -1,10 +1,14 @@
 """Client for interacting with Backstage Catalog API."""
 
+import asyncio
+import sys
 from collections.abc import AsyncIterator
+from itertools import chain
 from typing import Any
-from urllib.parse import quote, urljoin
+from urllib.parse import quote
 
 import httpx
+import orjson
 from pydantic import ValidationError
 
 from .config import Settings
@@ -12,6 +16,32 @@ from .logging import log_debug, log_error, log_info, log_warning
 from .models import Entity
 
 
+def _intern_common_fields(item: dict[str, Any]) -> None:
+    """Intern low-cardinality string fields so repeated values share one object.
+
+    Kinds, namespaces, types, lifecycles and owner refs are drawn from a
+    tiny vocabulary but arrive as fresh strings from every decoded page;
+    interning them cuts heap churn and makes later comparisons pointer
+    checks.
+    """
+    kind = item.get("kind")
+    if isinstance(kind, str):
+        item["kind"] = sys.intern(kind)
+
+    metadata = item.get("metadata")
+    if isinstance(metadata, dict):
+        namespace = metadata.get("namespace")
+        if isinstance(namespace, str):
+            metadata["namespace"] = sys.intern(namespace)
+
+    spec = item.get("spec")
+    if isinstance(spec, dict):
+        for key in ("type", "lifecycle", "owner"):
+            value = spec.get(key)
+            if isinstance(value, str):
+                spec[key] = sys.intern(value)
+
+
 class BackstageClient:
     """Async client for Backstage Catalog API."""
 
@@ -19,26 +49,49 @@ class BackstageClient:
         """Initialize the Backstage client."""
         self.settings = settings
         self.base_url = str(settings.backstage_base_url)
+        # Precompute endpoint URLs once; urljoin re-parses the full URL
+        # on every call and these are fixed for the client's lifetime
+        self._entities_url = self.base_url.rstrip("/") + "/api/catalog/entities"
+        self._by_name_url = self._entities_url + "/by-name/"
         self.headers = {
             "Accept": "application/json",
             "Content-Type": "application/json",
         }
         if settings.backstage_api_token:
             self.headers["Authorization"] = f"Bearer {settings.backstage_api_token}"
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use.
+
+        A single keepalive-pooled client lets concurrent fetches for
+        different kinds reuse connections instead of handshaking per call.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                verify=self.settings.verify_ssl,
+                timeout=httpx.Timeout(30.0),
+                limits=httpx.Limits(max_connections=20),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the shared HTTP client if one was created."""
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
 
     async def test_connection(self) -> bool:
         """Test the connection to Backstage API."""
         try:
-            async with httpx.AsyncClient(verify=self.settings.verify_ssl) as client:
-                url = urljoin(self.base_url, "/api/catalog/entities")
-                response = await client.get(
-                    url,
-                    headers=self.headers,
-                    params={"limit": 1},
-                )
-                response.raise_for_status()
-                log_info("Successfully connected to Backstage API")
-                return True
+            response = await self._get_client().get(
+                self._entities_url,
+                headers=self.headers,
+                params={"limit": 1},
+            )
+            response.raise_for_status()
+            log_info("Successfully connected to Backstage API")
+            return True
         except httpx.HTTPError as e:
             log_error(f"Failed to connect to Backstage API: {e}")
             return False
@@ -47,10 +100,25 @@ class BackstageClient:
         self,
         kind: str | None = None,
         filters: dict[str, str] | None = None,
+        limit: int | None = None,
     ) -> AsyncIterator[Entity]:
-        """Fetch entities from Backstage with pagination."""
+        """Fetch entities from Backstage with pagination.
+
+        When `limit` is given, at most that many entities are yielded and
+        the pagination requests no more pages than the limit needs —
+        callers that only display a page shouldn't pay for a prefetch
+        window of full-size requests behind it.
+        """
+        if limit is not None and limit <= 0:
+            return
+
+        page_size = self.settings.backstage_page_size
+        if limit is not None and limit < page_size:
+            # A single smaller page covers the whole request
+            page_size = limit
+
         params: dict[str, Any] = {
-            "limit": self.settings.backstage_page_size,
+            "limit": page_size,
         }
 
         # Build filter query
@@ -64,65 +132,127 @@ class BackstageClient:
         if filter_parts:
             params["filter"] = ",".join(filter_parts)
 
-        async with httpx.AsyncClient(
-            verify=self.settings.verify_ssl,
-            timeout=httpx.Timeout(30.0),
-        ) as client:
-            offset = 0
-            total_fetched = 0
-
-            while True:
-                params["offset"] = offset
-                url = urljoin(self.base_url, "/api/catalog/entities")
-
-                try:
-                    log_debug(f"Fetching entities from {url} with params: {params}")
-                    response = await client.get(url, headers=self.headers, params=params)
-                    response.raise_for_status()
-
-                    data = response.json()
-
-                    # Handle both array response and object with items
-                    if isinstance(data, list):
-                        items = data
-                    elif isinstance(data, dict) and "items" in data:
-                        items = data["items"]
-                    else:
-                        log_error(f"Unexpected API response format: {type(data)}")
-                        break
-
-                    if not items:
-                        break
-
-                    for item in items:
-                        try:
-                            entity = Entity(**item)
-                            total_fetched += 1
-                            yield entity
-                        except ValidationError as e:
-                            log_warning(f"Failed to parse entity: {e}")
-                            continue
-
-                    # Check if we've fetched all entities
-                    if len(items) < self.settings.backstage_page_size:
-                        break
-
-                    offset += len(items)
-
-                except httpx.HTTPError as e:
-                    log_error(f"Failed to fetch entities: {e}")
+        client = self._get_client()
+        url = self._entities_url
+        prefetch = self.settings.backstage_prefetch_pages
+
+        offset = 0
+        remaining = limit
+        done = False
+
+        while not done:
+            # Request a window of pages concurrently; offsets are stable
+            # in the catalog API, and consuming results in order keeps
+            # the yielded sequence identical to sequential pagination.
+            # The window never extends past the caller's limit.
+            window = prefetch
+            if remaining is not None:
+                window = min(prefetch, -(-remaining // page_size))
+            offsets = range(offset, offset + window * page_size, page_size)
+            pages = await asyncio.gather(
+                *(self._fetch_page(client, url, params, page_offset) for page_offset in offsets)
+            )
+
+            for items in pages:
+                if items is None:
+                    # Request failed; error already logged
+                    return
+
+                if not items:
+                    done = True
                     break
 
+                for item in items:
+                    try:
+                        _intern_common_fields(item)
+                        yield Entity.model_validate(item)
+                    except ValidationError as e:
+                        log_warning(f"Failed to parse entity: {e}")
+                        continue
+                    if remaining is not None:
+                        remaining -= 1
+                        if not remaining:
+                            return
+
+                # A short page means we've fetched all entities
+                if len(items) < page_size:
+                    done = True
+                    break
 
-    async def fetch_all_entities(self) -> list[Entity]:
-        """Fetch all enabled entity types from Backstage."""
-        all_entities = []
+            offset += window * page_size
+
+    async def _fetch_page(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params: dict[str, Any],
+        offset: int,
+    ) -> list[dict[str, Any]] | None:
+        """Fetch a single catalog page, returning its items or None on error."""
+        page_params = {**params, "offset": offset}
+
+        try:
+            log_debug(f"Fetching entities from {url} with params: {page_params}")
+            response = await client.get(url, headers=self.headers, params=page_params)
+            response.raise_for_status()
+
+            # orjson decodes the raw bytes considerably faster than the
+            # stdlib json used by response.json()
+            data = orjson.loads(response.content)
+
+            # Handle both array response and object with items
+            if isinstance(data, list):
+                return data
+            if isinstance(data, dict) and "items" in data:
+                return data["items"]
 
-        for kind in self.settings.enabled_entity_kinds:
-            async for entity in self.fetch_entities(kind=kind):
-                all_entities.append(entity)
+            log_error(f"Unexpected API response format: {type(data)}")
+            return None
+
+        except httpx.HTTPError as e:
+            log_error(f"Failed to fetch entities: {e}")
+            return None
+
+    async def count_entities(self, kind: str) -> int:
+        """Count entities of a kind without materializing them.
+
+        Issues a single limit=1 request and reads totalItems when the API
+        returns the paginated object form; array-style responses fall back
+        to iterating the pagination and counting.
+        """
+        params = {"limit": 1, "filter": f"kind={kind}"}
+        try:
+            response = await self._get_client().get(
+                self._entities_url, headers=self.headers, params=params
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+        except httpx.HTTPError as e:
+            log_error(f"Failed to count {kind} entities: {e}")
+            return 0
+
+        if isinstance(data, dict):
+            total = data.get("totalItems")
+            if isinstance(total, int):
+                return total
 
-        return all_entities
+        count = 0
+        async for _ in self.fetch_entities(kind=kind):
+            count += 1
+        return count
+
+    async def _collect_entities(self, kind: str) -> list[Entity]:
+        """Collect all entities of a single kind into a list."""
+        return [entity async for entity in self.fetch_entities(kind=kind)]
+
+    async def fetch_all_entities(self) -> list[Entity]:
+        """Fetch all enabled entity types from Backstage."""
+        # Fetch each kind concurrently; pagination within a kind stays
+        # sequential but the kinds overlap on the shared connection pool
+        results = await asyncio.gather(
+            *(self._collect_entities(kind) for kind in self.settings.enabled_entity_kinds)
+        )
+        return list(chain.from_iterable(results))
 
     async def fetch_entity_by_ref(self, entity_ref: str) -> Entity | None:
         """Fetch a single entity by its reference."""
@@ -143,31 +273,27 @@ class BackstageClient:
         # URL encode the namespace and name
         encoded_ref = f"{kind}:{namespace}/{quote(name, safe='')}"
 
-        async with httpx.AsyncClient(verify=self.settings.verify_ssl) as client:
-            url = urljoin(self.base_url, f"/api/catalog/entities/by-name/{encoded_ref}")
+        url = f"{self._by_name_url}{encoded_ref}"
 
-            try:
-                response = await client.get(url, headers=self.headers)
-                response.raise_for_status()
+        try:
+            response = await self._get_client().get(url, headers=self.headers)
+            response.raise_for_status()
 
-                data = response.json()
-                return Entity(**data)
+            data = orjson.loads(response.content)
+            return Entity.model_validate(data)
 
-            except httpx.HTTPError as e:
-                log_error(f"Failed to fetch entity {entity_ref}: {e}")
-                return None
+        except httpx.HTTPError as e:
+            log_error(f"Failed to fetch entity {entity_ref}: {e}")
+            return None
 
     async def fetch_users_and_groups(self) -> tuple[list[Entity], list[Entity]]:
         """Fetch all users and groups from Backstage."""
-        users = []
-        groups = []
-
-        if self.settings.sync_users_enabled:
-            async for entity in self.fetch_entities(kind="User"):
-                users.append(entity)
 
-        if self.settings.sync_groups_enabled:
-            async for entity in self.fetch_entities(kind="Group"):
-                groups.append(entity)
+        async def fetch_if(enabled: bool, kind: str) -> list[Entity]:
+            return await self._collect_entities(kind) if enabled else []
 
+        users, groups = await asyncio.gather(
+            fetch_if(self.settings.sync_users_enabled, "User"),
+            fetch_if(self.settings.sync_groups_enabled, "Group"),
+        )
         return users, groups
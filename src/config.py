@@ -1,6 +1,6 @@
 """Configuration management for Backstage to Glean connector."""
 
-from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field, HttpUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -30,6 +30,12 @@ class Settings(BaseSettings):
         ge=1,
         le=1000,
     )
+    backstage_prefetch_pages: int = Field(
+        4,
+        description="Number of catalog pages to request concurrently when paginating",
+        ge=1,
+        le=16,
+    )
 
     # Glean configuration
     glean_instance_name: str = Field(
@@ -60,6 +66,12 @@ class Settings(BaseSettings):
         ge=1,
         le=100,
     )
+    sync_concurrency: int = Field(
+        4,
+        description="Maximum number of concurrent requests to Glean when pushing batches",
+        ge=1,
+        le=32,
+    )
     sync_users_enabled: bool = Field(
         True,
         description="Whether to sync User entities from Backstage",
@@ -108,10 +120,9 @@ class Settings(BaseSettings):
     )
     
     # Permissions settings
-    default_permissions: str = Field(
+    default_permissions: Literal["none", "owner", "datasource-users", "all-users"] = Field(
         "datasource-users",
         description="Default permissions for documents: 'none', 'owner', 'datasource-users', 'all-users'",
-        pattern="^(none|owner|datasource-users|all-users)$",
     )
 
     @property
@@ -135,7 +146,26 @@ class Settings(BaseSettings):
         return kinds
 
 
-@lru_cache
+_settings: Settings | None = None
+
+
 def get_settings() -> Settings:
-    """Get cached settings instance."""
-    return Settings()
+    """Get the shared settings instance, loading it on first use.
+
+    A sentinel-guarded global is cheaper per call than the lru_cache it
+    replaces (no argument hashing or cache-dict probe) while keeping the
+    lazy load, so importing this module never touches the environment.
+    """
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+
+def reset_settings() -> None:
+    """Drop the cached settings so the next get_settings() reloads them.
+
+    Intended for tests that change environment variables between cases.
+    """
+    global _settings
+    _settings = None
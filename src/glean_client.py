@@ -1,16 +1,54 @@
 """Client for interacting with Glean Indexing API."""
 
 import asyncio
-import json
+from collections.abc import AsyncIterator, Iterable, Iterator
 from datetime import datetime
+from functools import lru_cache
+from itertools import groupby, islice
+from operator import attrgetter
 from pathlib import Path
 
+import httpx
+import orjson
 from glean.api_client import Glean, errors, models
+from glean.api_client.models import DocCategory, ObjectDefinition
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 from uuid_extensions import uuid7
 
 from .config import Settings
 from .logging import create_progress, log_error, log_info, log_warning
 
+# Transient network blips shouldn't fail a whole batch outright
+_RETRYABLE_ERRORS = (errors.GleanError, httpx.TransportError)
+
+@lru_cache(maxsize=1)
+def _object_definitions() -> list[ObjectDefinition]:
+    """Static datasource schema, built once on first use."""
+    return [
+        ObjectDefinition(
+            name="backstage_entity",
+            display_label="Backstage Entity",
+            doc_category=DocCategory.KNOWLEDGE,
+        )
+    ]
+
+
+def _retrying() -> AsyncRetrying:
+    """Build the retry policy for a single batch upload."""
+    return AsyncRetrying(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential_jitter(initial=1, max=10),
+        retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+        reraise=True,
+    )
+
+
+def _batches(items: Iterable, size: int) -> Iterator[list]:
+    """Yield successive batches of up to `size` items."""
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
 
 class GleanClient:
     """Client for pushing data to Glean."""
@@ -20,12 +58,29 @@ class GleanClient:
         self.settings = settings
         self.instance = settings.glean_instance_name
         self.api_token = settings.glean_indexing_api_key
+        # Bind hot settings once - Pydantic attribute access is not free in
+        # tight batch loops
+        self.datasource = settings.glean_datasource_id
+        self.batch_size = settings.sync_batch_size
+        self.url_regex = f"{settings.backstage_base_url}/.*"
+        self._glean: Glean | None = None
+
+    async def _get_client(self) -> Glean:
+        """Return the shared SDK client, opening it on first use.
+
+        A single client keeps one TLS session and connection pool alive
+        across every sync phase instead of re-handshaking per method call.
+        Closed by `close()`.
+        """
+        if self._glean is None:
+            self._glean = await Glean(
+                api_token=self.api_token,
+                instance=self.instance,
+            ).__aenter__()
+        return self._glean
 
     def _save_json_output(self, data: list, filename_prefix: str) -> None:
-        """Save data to JSON file when output_json is enabled."""
-        if not (self.settings.dry_run and self.settings.output_json):
-            return
-
+        """Save data to JSON file; caller has already checked output_json."""
         # Create output directory if it doesn't exist
         output_dir = Path(self.settings.output_json_dir)
         output_dir.mkdir(exist_ok=True)
@@ -35,16 +90,15 @@ class GleanClient:
         filename = f"{filename_prefix}_{timestamp}.json"
         filepath = output_dir / filename
 
-        # Convert Pydantic models to JSON
-        json_data = []
-        for item in data:
-            # Use model_dump_json and then parse to get dict
-            json_str = item.model_dump_json(exclude_none=True)
-            json_data.append(json.loads(json_str))
-
-        # Save to file
-        with open(filepath, "w") as f:
-            json.dump(json_data, f, indent=2)
+        # Stream items to disk one at a time so peak memory stays at one
+        # serialized record instead of the whole list
+        with open(filepath, "wb") as f:
+            f.write(b"[\n")
+            for i, item in enumerate(data):
+                if i:
+                    f.write(b",\n")
+                f.write(orjson.dumps(item.model_dump(mode="json", exclude_none=True), option=orjson.OPT_INDENT_2))
+            f.write(b"\n]\n")
 
         log_info(f"Saved {len(data)} {filename_prefix} to {filepath}")
 
@@ -52,16 +106,12 @@ class GleanClient:
         """Test the connection to Glean API."""
         try:
             # Try to get datasource config as a connection test
-            async with Glean(
-                api_token=self.api_token,
-                instance=self.instance,
-            ) as glean:
-                response = await asyncio.to_thread(
-                    glean.indexing.datasources.retrieve_config,
-                    datasource=self.settings.glean_datasource_id,
-                )
-                log_info(f"Successfully connected to Glean API. Datasource: {response.name}")
-                return True
+            glean = await self._get_client()
+            response = await glean.indexing.datasources.retrieve_config_async(
+                datasource=self.datasource,
+            )
+            log_info(f"Successfully connected to Glean API. Datasource: {response.name}")
+            return True
         except errors.GleanError as e:
             # Datasource might not exist yet, which is fine
             if e.status_code == 404:
@@ -76,42 +126,31 @@ class GleanClient:
     async def setup_datasource(self) -> bool:
         """Create or update the datasource configuration."""
         try:
-            async with Glean(
-                api_token=self.api_token,
-                instance=self.instance,
-            ) as glean:
-                # Check if datasource exists
-                try:
-                    await asyncio.to_thread(
-                        glean.indexing.datasources.retrieve_config,
-                        datasource=self.settings.glean_datasource_id,
-                    )
-                    log_info(f"Datasource '{self.settings.glean_datasource_id}' already exists")
-                    return True
-                except errors.GleanError as e:
-                    if e.status_code != 404:
-                        raise
-                    # Datasource doesn't exist, create it
-
-                # Create datasource
-                await asyncio.to_thread(
-                    glean.indexing.datasources.add,
-                    name=self.settings.glean_datasource_id,
-                    display_name=self.settings.glean_datasource_display_name,
-                    datasource_category=models.DatasourceCategory.UNCATEGORIZED,
-                    url_regex=f"{self.settings.backstage_base_url}/.*",
-                    icon_url=None,  # Could add Backstage logo URL here
-                    object_definitions=[
-                        models.ObjectDefinition(
-                            name="backstage_entity",
-                            display_label="Backstage Entity",
-                            doc_category=models.DocCategory.KNOWLEDGE,
-                        )
-                    ],
+            glean = await self._get_client()
+            # Check if datasource exists
+            try:
+                await glean.indexing.datasources.retrieve_config_async(
+                    datasource=self.datasource,
                 )
-
-                log_info(f"Created datasource '{self.settings.glean_datasource_id}'")
+                log_info(f"Datasource '{self.datasource}' already exists")
                 return True
+            except errors.GleanError as e:
+                if e.status_code != 404:
+                    raise
+                # Datasource doesn't exist, create it
+
+            # Create datasource
+            await glean.indexing.datasources.add_async(
+                name=self.datasource,
+                display_name=self.settings.glean_datasource_display_name,
+                datasource_category=models.DatasourceCategory.UNCATEGORIZED,
+                url_regex=self.url_regex,
+                icon_url=None,  # Could add Backstage logo URL here
+                object_definitions=_object_definitions(),
+            )
+
+            log_info(f"Created datasource '{self.datasource}'")
+            return True
 
         except Exception as e:
             log_error(f"Failed to setup datasource: {e}")
@@ -123,45 +162,97 @@ class GleanClient:
             log_warning("No documents to push")
             return True
 
-        if self.settings.dry_run:
+        settings = self.settings
+        if settings.dry_run:
             log_info(f"[DRY RUN] Would push {len(documents)} documents to Glean")
             for doc in documents[:5]:  # Show first 5 as examples
                 log_info(f"  - {doc.title} ({doc.id})")
             if len(documents) > 5:
                 log_info(f"  ... and {len(documents) - 5} more")
 
-            # Save to JSON if output_json is enabled
-            self._save_json_output(documents, "documents")
+            # Serializing the full list is the expensive part of a dry run;
+            # only do it when the user explicitly asked for JSON output
+            if settings.output_json:
+                self._save_json_output(documents, "documents")
             return True
 
-        success = True
-        total = len(documents)
-
-        async with Glean(
-            api_token=self.api_token,
-            instance=self.instance,
-        ) as glean:
-            with create_progress() as progress:
-                task = progress.add_task("Pushing documents to Glean", total=total)
-
-                # Process in batches
-                for i in range(0, total, self.settings.sync_batch_size):
-                    batch = documents[i : i + self.settings.sync_batch_size]
-
+        async def _aiter(items: list) -> AsyncIterator[models.DocumentDefinition]:
+            for item in items:
+                yield item
+
+        return await self.push_documents_stream(_aiter(documents), len(documents))
+
+    async def push_documents_stream(
+        self,
+        documents: AsyncIterator[models.DocumentDefinition],
+        expected_total: int,
+    ) -> bool:
+        """Push documents to Glean as the caller produces them.
+
+        Each batch is dispatched the moment it fills, so upload round-trips
+        overlap with whatever work (mapping, fetching) is still feeding the
+        iterator. Dry runs need the materialized list and go through
+        `push_documents` instead.
+        """
+        glean = await self._get_client()
+        pushed = 0
+
+        with create_progress() as progress:
+            task = progress.add_task("Pushing documents to Glean", total=expected_total)
+
+            # Push batches concurrently - each upload is independent, so overlap
+            # the network round-trips with bounded concurrency
+            semaphore = asyncio.Semaphore(self.settings.sync_concurrency)
+
+            # Coalesce progress updates: every update locks and re-renders
+            # the bar, so flush accumulated advances every few batches
+            pending = 0
+            completed = 0
+
+            def advance(count: int) -> None:
+                nonlocal pending, completed, pushed
+                pending += count
+                pushed += count
+                completed += 1
+                if completed % 4 == 0:
+                    progress.update(task, advance=pending)
+                    pending = 0
+
+            async def push_batch(batch: list, batch_num: int) -> bool:
+                async with semaphore:
                     try:
-                        await asyncio.to_thread(
-                            glean.indexing.documents.index,
-                            datasource=self.settings.glean_datasource_id,
-                            documents=batch,
-                        )
-                        progress.update(task, advance=len(batch))
-
+                        async for attempt in _retrying():
+                            with attempt:
+                                await glean.indexing.documents.index_async(
+                                    datasource=self.datasource,
+                                    documents=batch,
+                                )
+                        advance(len(batch))
+                        return True
                     except Exception as e:
-                        log_error(f"Failed to push batch {i//self.settings.sync_batch_size + 1}: {e}")
-                        success = False
+                        log_error(f"Failed to push batch {batch_num} after retries: {e}")
+                        return False
+
+            tasks: list[asyncio.Task] = []
+            batch: list[models.DocumentDefinition] = []
+            async for doc in documents:
+                batch.append(doc)
+                if len(batch) >= self.batch_size:
+                    tasks.append(asyncio.create_task(push_batch(batch, len(tasks) + 1)))
+                    batch = []
+                    # Give dispatched uploads a chance to start their I/O
+                    # before we go back to producing
+                    await asyncio.sleep(0)
+            if batch:
+                tasks.append(asyncio.create_task(push_batch(batch, len(tasks) + 1)))
+
+            results = await asyncio.gather(*tasks)
+            if pending:
+                progress.update(task, advance=pending)
+            success = all(results)
 
         if success:
-            log_info(f"Successfully pushed {total} documents")
+            log_info(f"Successfully pushed {pushed} documents")
         else:
             log_warning("Pushed documents with some errors")
 
@@ -179,38 +270,48 @@ class GleanClient:
             if len(users) > 5:
                 log_info(f"  ... and {len(users) - 5} more")
 
-            # Save to JSON if output_json is enabled
-            self._save_json_output(users, "users")
+            # Serialization is the expensive part; skip unless requested
+            if self.settings.output_json:
+                self._save_json_output(users, "users")
             return True
 
         try:
-            async with Glean(
-                api_token=self.api_token,
-                instance=self.instance,
-            ) as glean:
-                # Generate upload ID for this sync
-                upload_id = f"{self.settings.glean_datasource_id}-users-{str(uuid7())}"
-
-                # Push users in batches
-                total_batches = (len(users) + self.settings.sync_batch_size - 1) // self.settings.sync_batch_size
-                for i in range(0, len(users), self.settings.sync_batch_size):
-                    batch = users[i : i + self.settings.sync_batch_size]
-                    batch_num = i // self.settings.sync_batch_size
-                    is_first = batch_num == 0
-                    is_last = batch_num == total_batches - 1
-
-                    await asyncio.to_thread(
-                        glean.indexing.permissions.bulk_index_users,
-                        upload_id=upload_id,
-                        datasource=self.settings.glean_datasource_id,
-                        users=batch,
-                        is_first_page=is_first,
-                        is_last_page=is_last,
-                        force_restart_upload=is_first,
+            glean = await self._get_client()
+            # Generate upload ID for this sync
+            upload_id = f"{self.datasource}-users-{uuid7()}"
+
+            batches = list(_batches(users, self.batch_size))
+            last = len(batches) - 1
+
+            async def upload_page(page_num: int, batch: list) -> None:
+                await glean.indexing.permissions.bulk_index_users_async(
+                    upload_id=upload_id,
+                    datasource=self.datasource,
+                    users=batch,
+                    is_first_page=page_num == 0,
+                    is_last_page=page_num == last,
+                    force_restart_upload=page_num == 0,
+                )
+
+            # The first page opens the upload and the last page seals it,
+            # so both stay sequential; the middle pages of one upload_id
+            # are order-independent and overlap under the concurrency bound
+            await upload_page(0, batches[0])
+            if last > 0:
+                if last > 1:
+                    semaphore = asyncio.Semaphore(self.settings.sync_concurrency)
+
+                    async def upload_middle(page_num: int, batch: list) -> None:
+                        async with semaphore:
+                            await upload_page(page_num, batch)
+
+                    await asyncio.gather(
+                        *(upload_middle(i, batch) for i, batch in enumerate(batches[1:last], start=1))
                     )
+                await upload_page(last, batches[last])
 
-                log_info(f"Successfully pushed {len(users)} users")
-                return True
+            log_info(f"Successfully pushed {len(users)} users")
+            return True
 
         except Exception as e:
             log_error(f"Failed to push users: {e}")
@@ -228,38 +329,48 @@ class GleanClient:
             if len(groups) > 5:
                 log_info(f"  ... and {len(groups) - 5} more")
 
-            # Save to JSON if output_json is enabled
-            self._save_json_output(groups, "groups")
+            # Serialization is the expensive part; skip unless requested
+            if self.settings.output_json:
+                self._save_json_output(groups, "groups")
             return True
 
         try:
-            async with Glean(
-                api_token=self.api_token,
-                instance=self.instance,
-            ) as glean:
-                # Generate upload ID for this sync
-                upload_id = f"{self.settings.glean_datasource_id}-groups-{str(uuid7())}"
-
-                # Push groups in batches
-                total_batches = (len(groups) + self.settings.sync_batch_size - 1) // self.settings.sync_batch_size
-                for i in range(0, len(groups), self.settings.sync_batch_size):
-                    batch = groups[i : i + self.settings.sync_batch_size]
-                    batch_num = i // self.settings.sync_batch_size
-                    is_first = batch_num == 0
-                    is_last = batch_num == total_batches - 1
-
-                    await asyncio.to_thread(
-                        glean.indexing.permissions.bulk_index_groups,
-                        upload_id=upload_id,
-                        datasource=self.settings.glean_datasource_id,
-                        groups=batch,
-                        is_first_page=is_first,
-                        is_last_page=is_last,
-                        force_restart_upload=is_first,
+            glean = await self._get_client()
+            # Generate upload ID for this sync
+            upload_id = f"{self.datasource}-groups-{uuid7()}"
+
+            batches = list(_batches(groups, self.batch_size))
+            last = len(batches) - 1
+
+            async def upload_page(page_num: int, batch: list) -> None:
+                await glean.indexing.permissions.bulk_index_groups_async(
+                    upload_id=upload_id,
+                    datasource=self.datasource,
+                    groups=batch,
+                    is_first_page=page_num == 0,
+                    is_last_page=page_num == last,
+                    force_restart_upload=page_num == 0,
+                )
+
+            # The first page opens the upload and the last page seals it,
+            # so both stay sequential; the middle pages of one upload_id
+            # are order-independent and overlap under the concurrency bound
+            await upload_page(0, batches[0])
+            if last > 0:
+                if last > 1:
+                    semaphore = asyncio.Semaphore(self.settings.sync_concurrency)
+
+                    async def upload_middle(page_num: int, batch: list) -> None:
+                        async with semaphore:
+                            await upload_page(page_num, batch)
+
+                    await asyncio.gather(
+                        *(upload_middle(i, batch) for i, batch in enumerate(batches[1:last], start=1))
                     )
+                await upload_page(last, batches[last])
 
-                log_info(f"Successfully pushed {len(groups)} groups")
-                return True
+            log_info(f"Successfully pushed {len(groups)} groups")
+            return True
 
         except Exception as e:
             log_error(f"Failed to push groups: {e}")
@@ -278,41 +389,52 @@ class GleanClient:
             if len(memberships) > 5:
                 log_info(f"  ... and {len(memberships) - 5} more")
 
-            # Save to JSON if output_json is enabled
-            self._save_json_output(memberships, "memberships")
+            # Serialization is the expensive part; skip unless requested
+            if self.settings.output_json:
+                self._save_json_output(memberships, "memberships")
             return True
 
         try:
-            async with Glean(
-                api_token=self.api_token,
-                instance=self.instance,
-            ) as glean:
-                # Group memberships by group for bulk operations
-                memberships_by_group = {}
-                for membership in memberships:
-                    group_name = membership.group_name
-                    if group_name not in memberships_by_group:
-                        memberships_by_group[group_name] = []
-                    memberships_by_group[group_name].append(membership)
-
-                # Push memberships for each group
-                for group_name, group_memberships in memberships_by_group.items():
-                    # Convert to bulk format
-                    bulk_memberships = [models.DatasourceBulkMembershipDefinition(member_user_id=m.member_user_id) for m in group_memberships]
-
-                    await asyncio.to_thread(
-                        glean.indexing.permissions.bulk_index_memberships,
-                        upload_id=f"{self.settings.glean_datasource_id}-{group_name}-memberships-{str(uuid7())}",
-                        datasource=self.settings.glean_datasource_id,
-                        group=group_name,
-                        memberships=bulk_memberships,
-                        is_first_page=True,
-                        is_last_page=True,
-                        force_restart_upload=True,
-                    )
+            glean = await self._get_client()
+            # Each group has its own upload_id, so the uploads are fully
+            # independent - push them concurrently under the semaphore
+            semaphore = asyncio.Semaphore(self.settings.sync_concurrency)
+            upload_id_prefix = f"{self.datasource}-"
+            # The inputs are our own already-validated models, so skip
+            # re-validation with model_construct; bind it once locally
+            make_bulk = models.DatasourceBulkMembershipDefinition.model_construct
+
+            async def upload_group(group_name: str, group_memberships: list) -> bool:
+                bulk_memberships = [make_bulk(member_user_id=m.member_user_id) for m in group_memberships]
+                async with semaphore:
+                    try:
+                        await glean.indexing.permissions.bulk_index_memberships_async(
+                            upload_id=f"{upload_id_prefix}{group_name}-memberships-{uuid7()}",
+                            datasource=self.datasource,
+                            group=group_name,
+                            memberships=bulk_memberships,
+                            is_first_page=True,
+                            is_last_page=True,
+                            force_restart_upload=True,
+                        )
+                        return True
+                    except Exception as e:
+                        log_error(f"Failed to push memberships for group {group_name}: {e}")
+                        return False
 
-                log_info(f"Successfully pushed {len(memberships)} group memberships across {len(memberships_by_group)} groups")
-                return True
+            # Sort once and group lazily: each group's memberships are carved
+            # off and handed straight to an upload coroutine instead of
+            # building a full grouping dict up front
+            by_group = attrgetter("group_name")
+            grouped = groupby(sorted(memberships, key=by_group), key=by_group)
+
+            tasks = [upload_group(name, list(members)) for name, members in grouped]
+            results = await asyncio.gather(*tasks)
+            if not all(results):
+                return False
+
+            log_info(f"Successfully pushed {len(memberships)} group memberships across {len(tasks)} groups")
+            return True
 
         except Exception as e:
             log_error(f"Failed to push memberships: {e}")
@@ -325,20 +447,17 @@ class GleanClient:
             return True
 
         try:
-            async with Glean(
-                api_token=self.api_token,
-                instance=self.instance,
-            ) as glean:
-                # Note: process_all may be datasource-specific and handled differently
-                # For now, we'll skip this step as the main sync is working
-                log_info("Documents successfully pushed - Indexing may take 1-4 hours to complete before documents are visible (depending on the current jobs in progress)")
-                return True
+            # Note: process_all may be datasource-specific and handled differently
+            # For now, we'll skip this step as the main sync is working
+            log_info("Documents successfully pushed - Indexing may take 1-4 hours to complete before documents are visible (depending on the current jobs in progress)")
+            return True
 
         except Exception as e:
             log_error(f"Failed to trigger process all documents: {e}")
             return False
 
     async def close(self):
-        """Close the API client."""
-        # The new SDK uses context managers, so no explicit close needed
-        pass
+        """Close the shared API client if it was opened."""
+        if self._glean is not None:
+            glean, self._glean = self._glean, None
+            await glean.__aexit__(None, None, None)
@@ -1,6 +1,7 @@
 """Logging configuration using Rich."""
 
 import logging
+import os
 
 from rich.console import Console
 from rich.logging import RichHandler
@@ -12,17 +13,24 @@ console = Console()
 # Create a separate console for logging that goes to stderr
 log_console = Console(stderr=True)
 
+# Log level can be overridden via LOG_LEVEL (e.g. LOG_LEVEL=DEBUG)
+_log_level = getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO)
+
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=_log_level,
     format="%(message)s",
     datefmt="[%X]",
     handlers=[
         RichHandler(
             console=log_console,
             rich_tracebacks=True,
-            tracebacks_show_locals=True,
-            markup=True,
+            # Rendering locals for every traceback frame is expensive;
+            # only do it when running at DEBUG
+            tracebacks_show_locals=_log_level <= logging.DEBUG,
+            # Log messages are plain text (colored output goes through
+            # console.print); skip per-message markup tokenization
+            markup=False,
             show_time=False,
             show_path=False,
         )
@@ -38,6 +46,11 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
+# Shared logger for the module-level helpers below; avoids a registry
+# lookup on every call
+_logger = logging.getLogger("src")
+
+
 def create_progress() -> Progress:
     """Create a progress bar for tracking operations."""
     return Progress(
@@ -51,28 +64,27 @@ def create_progress() -> Progress:
 
 def log_info(message: str, extra: dict | None = None) -> None:
     """Log an info message with optional extra context."""
-    logger = get_logger("src")
     if extra:
-        message = f"{message} | {extra}"
-    logger.info(message)
+        # Lazy %-formatting: the extra dict is only stringified if the
+        # record is actually emitted at this level
+        _logger.info("%s | %s", message, extra)
+    else:
+        _logger.info(message)
 
 
 def log_error(message: str, exception: Exception | None = None) -> None:
     """Log an error message with optional exception."""
-    logger = get_logger("src")
     if exception:
-        logger.error(message, exc_info=True)
+        _logger.error(message, exc_info=True)
     else:
-        logger.error(message)
+        _logger.error(message)
 
 
 def log_warning(message: str) -> None:
     """Log a warning message."""
-    logger = get_logger("src")
-    logger.warning(message)
+    _logger.warning(message)
 
 
 def log_debug(message: str) -> None:
     """Log a debug message."""
-    logger = get_logger("src")
-    logger.debug(message)
+    _logger.debug(message)
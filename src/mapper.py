@@ -1,7 +1,8 @@
 """Data mapper for converting Backstage entities to Glean format."""
 
 import re
-from urllib.parse import urljoin
+from collections import defaultdict
+from itertools import chain
 
 from glean.api_client import models
 
@@ -9,6 +10,45 @@ from .config import Settings
 from .logging import log_warning
 from .models import Entity
 
+# Markdown-stripping patterns, compiled once at import. All inline rules
+# (code, images, links, emphasis) are fused into a single alternation so
+# one scan handles them all; line-anchored rules (headers, horizontal
+# rules) share a second pattern.
+_RE_INLINE_MARKUP = re.compile(
+    r"```(?P<block>[^`]*)```"
+    r"|`(?P<code>[^`]+)`"
+    r"|!\[(?P<image>[^\]]*)\]\([^)]+\)"
+    r"|\[(?P<link>[^\]]+)\]\([^)]+\)"
+    r"|\*\*(?P<bold>[^*]+)\*\*"
+    r"|\*(?P<italic>[^*]+)\*"
+    r"|__(?P<bold_u>[^_]+)__"
+    r"|_(?P<italic_u>[^_]+)_"
+)
+_RE_LINE_MARKUP = re.compile(r"^(?:#+\s+|[-*_]{3,}$)", re.MULTILINE)
+_RE_EXTRA_NEWLINES = re.compile(r"\n{3,}")
+
+# Static lookup tables hoisted out of the per-entity mapping path
+_KIND_MAPPING = {
+    "Domain": "domain",
+    "System": "system",
+    "Component": "component",
+    "API": "api",
+    "Resource": "resource",
+}
+_IMPORTANT_ANNOTATIONS = (
+    ("backstage.io/techdocs-ref", "Documentation"),
+    ("github.com/project-slug", "GitHub Project"),
+    ("backstage.io/source-location", "Source Location"),
+)
+
+
+def _inline_text(match: re.Match) -> str:
+    """Return the plain text for an inline markdown match."""
+    if match.lastgroup == "image":
+        # Images are dropped entirely
+        return ""
+    return match.group(match.lastgroup) or ""
+
 
 class BackstageToGleanMapper:
     """Maps Backstage entities to Glean document and identity formats."""
@@ -16,11 +56,41 @@ class BackstageToGleanMapper:
     def __init__(self, backstage_base_url: str, datasource_id: str, settings: Settings | None = None):
         """Initialize the mapper."""
         self.backstage_base_url = backstage_base_url
+        # Precomputed once so per-entity URL building is pure f-string
+        # concatenation rather than a urljoin re-parse
+        self._catalog_url_prefix = backstage_base_url.rstrip("/") + "/catalog/"
         self.datasource_id = datasource_id
         self.settings = settings
+        # Caches of mapped output keyed by entity version, so unchanged
+        # entities skip re-mapping on repeated syncs in the same process
+        self._document_cache: dict[tuple, models.DocumentDefinition] = {}
+        self._user_cache: dict[tuple, models.DatasourceUserDefinition] = {}
+        self._group_cache: dict[tuple, models.DatasourceGroupDefinition] = {}
+        # Name-lookup indexes over the current entity_map, built once per
+        # map instead of scanning it per reference resolution; the map
+        # itself is held so identity checks cannot hit a reused id()
+        self._index_source: dict[str, Entity] | None = None
+        self._name_index: dict[str, Entity] = {}
+        self._typed_name_index: dict[tuple[str, str], Entity] = {}
+
+    @staticmethod
+    def _entity_cache_key(entity: Entity) -> tuple:
+        """Build a cache key identifying an entity at a specific version.
+
+        Backstage's etag changes whenever an entity changes; when it is
+        absent, fall back to a digest of the full serialized entity.
+        """
+        meta = entity.metadata
+        version = meta.etag or hash(entity.model_dump_json())
+        return (entity.kind, meta.namespace, meta.name, version)
 
     def map_user_to_glean(self, user: Entity) -> models.DatasourceUserDefinition:
         """Map a Backstage User entity to Glean user format."""
+        cache_key = self._entity_cache_key(user)
+        cached = self._user_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         user_spec = user.spec
         profile = user_spec.get("profile", {})
 
@@ -33,7 +103,7 @@ class BackstageToGleanMapper:
             email = f"{user.metadata.name}@backstage.local"
             log_warning(f"No email found for user {user.metadata.name}, using placeholder: {email}")
 
-        return models.DatasourceUserDefinition(
+        glean_user = models.DatasourceUserDefinition(
             email=email,
             name=display_name,
             user_id=user.metadata.name,
@@ -41,34 +111,53 @@ class BackstageToGleanMapper:
             photo_url=profile.get("picture"),
             datasource=self.datasource_id,
         )
+        self._user_cache[cache_key] = glean_user
+        return glean_user
 
     def map_group_to_glean(self, group: Entity) -> models.DatasourceGroupDefinition:
         """Map a Backstage Group entity to Glean group format."""
+        cache_key = self._entity_cache_key(group)
+        cached = self._group_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         group_spec = group.spec
         profile = group_spec.get("profile", {})
 
-        return models.DatasourceGroupDefinition(
+        glean_group = models.DatasourceGroupDefinition(
             name=group.metadata.name,
             display_name=profile.get("displayName", group.metadata.name),
             datasource=self.datasource_id,
         )
-
-    def map_group_memberships(self, users: list[Entity], groups: list[Entity]) -> list[models.DatasourceMembershipDefinition]:
-        """Map user-group relationships to Glean membership format."""
-        memberships = []
-
-        # Create a map of group names to their members
-        group_members: dict[str, list[str]] = {}
-
-        # Process user memberOf relationships
-        for user in users:
-            member_of = user.spec.get("memberOf", [])
-            for group_ref in member_of:
-                # Extract group name from reference
-                group_name = group_ref.split("/")[-1] if "/" in group_ref else group_ref
-                if group_name not in group_members:
-                    group_members[group_name] = []
-                group_members[group_name].append(user.metadata.name)
+        self._group_cache[cache_key] = glean_group
+        return glean_group
+
+    def map_group_memberships(
+        self,
+        users: list[Entity],
+        groups: list[Entity],
+        members_by_group: dict[str, set[str]] | None = None,
+    ) -> list[models.DatasourceMembershipDefinition]:
+        """Map user-group relationships to Glean membership format.
+
+        Pass `members_by_group` (as produced by utils.process_users) to
+        reuse a memberOf inversion computed during deduplication instead
+        of walking the user list again here.
+        """
+        # Create a map of group names to their members; sets make the
+        # dedupe check O(1) instead of scanning a growing list
+        group_members: dict[str, set[str]] = defaultdict(set)
+
+        if members_by_group is not None:
+            group_members.update(members_by_group)
+        else:
+            # Process user memberOf relationships
+            for user in users:
+                member_of = user.spec.get("memberOf", [])
+                for group_ref in member_of:
+                    # Extract group name from reference
+                    group_name = group_ref.rpartition("/")[2] or group_ref
+                    group_members[group_name].add(user.metadata.name)
 
         # Process group member relationships
         for group in groups:
@@ -76,90 +165,87 @@ class BackstageToGleanMapper:
             for relation in group.relations:
                 if relation.type == "hasMember":
                     # Extract user name from targetRef
-                    user_name = relation.targetRef.split("/")[-1] if "/" in relation.targetRef else relation.targetRef
-                    if group.metadata.name not in group_members:
-                        group_members[group.metadata.name] = []
-                    if user_name not in group_members[group.metadata.name]:
-                        group_members[group.metadata.name].append(user_name)
-
-        # Convert to Glean membership format
-        for group_name, members in group_members.items():
-            for member in members:
-                memberships.append(
-                    models.DatasourceMembershipDefinition(
-                        group_name=group_name,
-                        member_user_id=member,
-                    )
-                )
-
-        return memberships
+                    user_name = relation.targetRef.rpartition("/")[2] or relation.targetRef
+                    group_members[group.metadata.name].add(user_name)
+
+        # Convert to Glean membership format in one fused pass
+        make_membership = models.DatasourceMembershipDefinition
+        return list(
+            chain.from_iterable(
+                (make_membership(group_name=group_name, member_user_id=member) for member in members)
+                for group_name, members in group_members.items()
+            )
+        )
 
     def map_entity_to_document(self, entity: Entity, entity_map: dict[str, Entity] | None = None) -> models.DocumentDefinition:
         """Map a Backstage catalog entity to Glean document format."""
+        # Validate the indexes (and with them the document cache) before
+        # the cache lookup: cached documents bake in container info from
+        # the map they were built against, so a new map must not serve
+        # documents built from the old one. The map presence is part of
+        # the key because a map-less call cannot resolve containers.
+        if entity_map is not None:
+            self._ensure_ref_indexes(entity_map)
+        cache_key = (self._entity_cache_key(entity), entity_map is not None)
+        cached = self._document_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         # Build document URL
         doc_url = self._get_entity_url(entity)
 
+        # Hoist the hot attribute lookups; spec values are read once each
+        spec = entity.spec
+        metadata = entity.metadata
+        kind = entity.kind
+        entity_type = spec.get("type")
+        lifecycle = spec.get("lifecycle")
+        system = spec.get("system")
+        domain = spec.get("domain")
+
         # Extract owner information
-        owner_ref = entity.spec.get("owner")
+        owner_ref = spec.get("owner")
         owner_type = None
         owner_id = None
         if owner_ref:
             # Parse owner reference (could be user:default/john.doe or group:default/team-a)
             owner_type, owner_id = self._parse_entity_ref(owner_ref)
 
-        # Build content from entity data
-        content_parts = []
-
-        # Skip description from content if we're adding it to summary
-        # (We'll handle description as summary below)
-
-        # Add metadata
-        content_parts.append("## Details")
-        content_parts.append(f"- **Kind**: {entity.kind}")
-        content_parts.append(f"- **Type**: {entity.spec.get('type', 'N/A')}")
-        content_parts.append(f"- **Lifecycle**: {entity.spec.get('lifecycle', 'N/A')}")
-        if owner_ref:
-            content_parts.append(f"- **Owner**: {owner_ref}")
-        if entity.spec.get("system"):
-            content_parts.append(f"- **System**: {entity.spec.get('system')}")
-        if entity.spec.get("domain"):
-            content_parts.append(f"- **Domain**: {entity.spec.get('domain')}")
+        # Build content from entity data as one string; the static details
+        # block is a single f-string and each optional section appends in
+        # place, so no intermediate parts list or final join pass is needed
+        # (Description is skipped here; it becomes the summary below)
+        content = (
+            f"## Details\n- **Kind**: {kind}\n- **Type**: {entity_type or 'N/A'}\n- **Lifecycle**: {lifecycle or 'N/A'}"
+            + (f"\n- **Owner**: {owner_ref}" if owner_ref else "")
+            + (f"\n- **System**: {system}" if system else "")
+            + (f"\n- **Domain**: {domain}" if domain else "")
+        )
 
         # Add tags
-        if entity.metadata.tags:
-            content_parts.append("")
-            content_parts.append(f"**Tags**: {', '.join(entity.metadata.tags)}")
+        if metadata.tags:
+            content += f"\n\n**Tags**: {', '.join(metadata.tags)}"
 
         # Add links
-        if entity.metadata.links:
-            content_parts.append("")
-            content_parts.append("## Links")
-            for link in entity.metadata.links:
-                content_parts.append(f"- [{link.get('title', 'Link')}]({link.get('url')})")
+        if metadata.links:
+            links_text = "\n".join(f"- [{link.get('title', 'Link')}]({link.get('url')})" for link in metadata.links)
+            content += f"\n\n## Links\n{links_text}"
 
         # Add annotations (selected ones)
-        important_annotations = {
-            "backstage.io/techdocs-ref": "Documentation",
-            "github.com/project-slug": "GitHub Project",
-            "backstage.io/source-location": "Source Location",
-        }
-
-        annotations_to_show = {}
-        for key, label in important_annotations.items():
-            if key in entity.metadata.annotations:
-                annotations_to_show[label] = entity.metadata.annotations[key]
-
-        if annotations_to_show:
-            content_parts.append("")
-            content_parts.append("## Annotations")
-            for label, value in annotations_to_show.items():
-                content_parts.append(f"- **{label}**: {value}")
+        annotations = metadata.annotations
+        annotation_lines = "\n".join(
+            f"- **{label}**: {annotations[key]}" for key, label in _IMPORTANT_ANNOTATIONS if key in annotations
+        )
+        if annotation_lines:
+            content += f"\n\n## Annotations\n{annotation_lines}"
 
         # Skip API definition from content if we're adding it to body
         # (We'll handle definition as body below)
 
         # Build permissions based on settings
-        permissions = models.DocumentPermissionsDefinition()
+        # These models wrap values we built ourselves, so model_construct
+        # skips the redundant validation pass
+        permissions = models.DocumentPermissionsDefinition.model_construct()
 
         if self.settings and self.settings.default_permissions:
             if self.settings.default_permissions == "none":
@@ -170,7 +256,7 @@ class BackstageToGleanMapper:
                 if owner_type and owner_id:
                     if owner_type == "user":
                         permissions.allowed_users = [
-                            models.UserReferenceDefinition(
+                            models.UserReferenceDefinition.model_construct(
                                 datasource_user_id=owner_id,
                                 datasource=self.datasource_id,
                             )
@@ -187,14 +273,14 @@ class BackstageToGleanMapper:
             permissions.allow_all_datasource_users_access = True
 
         # Create document
-        doc = models.DocumentDefinition(
+        doc = models.DocumentDefinition.model_construct(
             datasource=self.datasource_id,
-            id=f"{entity.kind.lower()}-{entity.metadata.namespace}-{entity.metadata.name}",
-            title=entity.metadata.name,
+            id=f"{kind.lower()}-{metadata.namespace}-{metadata.name}",
+            title=metadata.name,
             view_url=doc_url,  # Fixed field name from url to view_url
-            content=models.ContentDefinition(
+            content=models.ContentDefinition.model_construct(
                 mime_type="text/plain",
-                text_content="\n".join(content_parts),
+                text_content=content,
             ),
             permissions=permissions,
             object_type=self._get_object_type(entity),
@@ -202,25 +288,25 @@ class BackstageToGleanMapper:
 
         # Add owner field if owner is a user
         if owner_type == "user" and owner_id:
-            doc.owner = models.UserReferenceDefinition(
+            doc.owner = models.UserReferenceDefinition.model_construct(
                 datasource_user_id=owner_id,
                 datasource=self.datasource_id,
             )
 
         # Add summary from description if available
-        if entity.metadata.description:
+        if metadata.description:
             # Convert markdown to plain text if needed
-            summary_text = self._convert_markdown_to_plain_text(entity.metadata.description)
-            doc.summary = models.ContentDefinition(
+            summary_text = self._convert_markdown_to_plain_text(metadata.description)
+            doc.summary = models.ContentDefinition.model_construct(
                 mime_type="text/plain",
                 text_content=summary_text,
             )
 
         # Add body from spec.definition if available
-        if entity.spec.get("definition"):
-            definition = entity.spec.get("definition", "")
+        definition = spec.get("definition")
+        if definition:
             mime_type = self._detect_definition_mime_type(entity, definition)
-            doc.body = models.ContentDefinition(
+            doc.body = models.ContentDefinition.model_construct(
                 mime_type=mime_type,
                 text_content=definition,
             )
@@ -236,55 +322,45 @@ class BackstageToGleanMapper:
         custom_props = []
 
         # Add entity metadata as custom properties
-        custom_props.append(models.CustomProperty(name="namespace", value=entity.metadata.namespace))
+        custom_props.append(models.CustomProperty.model_construct(name="namespace", value=metadata.namespace))
 
-        if entity.spec.get("type"):
-            custom_props.append(models.CustomProperty(name="kind", value=entity.spec.get("type")))
-        if entity.spec.get("lifecycle"):
-            custom_props.append(models.CustomProperty(name="lifecycle", value=entity.spec.get("lifecycle").title()))
+        if entity_type:
+            custom_props.append(models.CustomProperty.model_construct(name="kind", value=entity_type))
+        if lifecycle:
+            custom_props.append(models.CustomProperty.model_construct(name="lifecycle", value=lifecycle.title()))
 
-        custom_props.append(models.CustomProperty(name="ref", value=entity.ref))
+        custom_props.append(models.CustomProperty.model_construct(name="ref", value=entity.ref))
 
         doc.custom_properties = custom_props
 
         # Add tags as document tags field (not custom property)
-        if entity.metadata.tags:
-            doc.tags = entity.metadata.tags
+        if metadata.tags:
+            doc.tags = metadata.tags
 
+        self._document_cache[cache_key] = doc
         return doc
 
     def _get_entity_url(self, entity: Entity) -> str:
         """Get the Backstage UI URL for an entity."""
         # Always construct URL from base URL using Backstage's URL format
         namespace = entity.metadata.namespace or "default"
-        return urljoin(self.backstage_base_url, f"/catalog/{namespace}/{entity.kind.lower()}/{entity.metadata.name}")
+        return f"{self._catalog_url_prefix}{namespace}/{entity.kind.lower()}/{entity.metadata.name}"
 
     def _parse_entity_ref(self, ref: str) -> tuple[str, str]:
         """Parse an entity reference like 'user:default/john.doe' into (type, name)."""
-        if ":" in ref:
-            parts = ref.split(":", 1)  # Split only on first colon
-            if len(parts) == 2:
-                entity_type = parts[0]
-                # Handle both "user:guest" and "user:default/john.doe" formats
-                if "/" in parts[1]:
-                    entity_name = parts[1].split("/")[-1]
-                else:
-                    entity_name = parts[1]
-                return entity_type, entity_name
+        # partition avoids the list allocation of split and stops at the
+        # first delimiter
+        entity_type, sep, rest = ref.partition(":")
+        if sep:
+            # Handle both "user:guest" and "user:default/john.doe" formats
+            return entity_type, rest.rpartition("/")[2] or rest
 
         # Fallback - assume it's just a name
         return "unknown", ref
 
     def _get_object_type(self, entity: Entity) -> str:
         """Map Backstage kind to Glean object type."""
-        kind_mapping = {
-            "Domain": "domain",
-            "System": "system",
-            "Component": "component",
-            "API": "api",
-            "Resource": "resource",
-        }
-        return kind_mapping.get(entity.kind, entity.kind.lower())
+        return _KIND_MAPPING.get(entity.kind) or entity.kind.lower()
 
     def _get_container_info(self, entity: Entity, entity_map: dict[str, Entity]) -> dict[str, str] | None:
         """Determine parent container for entity."""
@@ -323,6 +399,33 @@ class BackstageToGleanMapper:
 
         return None
 
+    def _ensure_ref_indexes(self, entity_map: dict[str, Entity]) -> None:
+        """Build name-lookup indexes for an entity map, once per map.
+
+        Holds a strong reference to the indexed map and compares with
+        `is`: an id() comparison could silently accept a new dict that
+        reused a collected map's address.
+        """
+        if self._index_source is entity_map:
+            return
+
+        name_index: dict[str, Entity] = {}
+        typed_name_index: dict[tuple[str, str], Entity] = {}
+        for entity in entity_map.values():
+            name = entity.metadata.name
+            # setdefault keeps the first entity seen, matching the old
+            # first-match-wins scan order
+            name_index.setdefault(name, entity)
+            typed_name_index.setdefault((entity.kind.lower(), name), entity)
+
+        self._name_index = name_index
+        self._typed_name_index = typed_name_index
+        self._index_source = entity_map
+        # Cached documents embed container info resolved from the previous
+        # map; a changed map (e.g. a renamed system) invalidates them even
+        # for entities whose own version is unchanged
+        self._document_cache.clear()
+
     def _resolve_entity_ref(self, ref: str, entity_map: dict[str, Entity]) -> Entity | None:
         """Resolve an entity reference to an actual entity."""
         # Try full reference first
@@ -338,95 +441,41 @@ class BackstageToGleanMapper:
         if full_ref in entity_map:
             return entity_map[full_ref]
 
-        # 2. Try without type prefix for same-kind references
-        for _key, entity in entity_map.items():
-            if entity.metadata.name == entity_name:
-                # If type is specified, it must match
-                if entity_type != "unknown" and entity.kind.lower() != entity_type.lower():
-                    continue
-                return entity
-
-        # 3. Try to find by name only (for plain references like "team-a")
-        if entity_type == "unknown":
-            # Look for exact name match
-            for _key, entity in entity_map.items():
-                if entity.metadata.name == ref:
-                    return entity
+        self._ensure_ref_indexes(entity_map)
 
-        return None
+        # 2. Typed references must match the entity kind
+        if entity_type != "unknown":
+            return self._typed_name_index.get((entity_type.lower(), entity_name))
+
+        # 3. Plain references (like "team-a") match by name only
+        return self._name_index.get(entity_name) or self._name_index.get(ref)
 
     def _convert_markdown_to_plain_text(self, text: str) -> str:
         """Convert markdown text to plain text."""
         # Basic markdown to plain text conversion
         # Remove markdown formatting but keep the content readable
 
-        # Remove code blocks
-        text = re.sub(r"```[^`]*```", lambda m: m.group(0).replace("```", ""), text)
-        text = re.sub(r"`([^`]+)`", r"\1", text)
-
-        # Remove headers (keep text)
-        text = re.sub(r"^#+\s+", "", text, flags=re.MULTILINE)
-
-        # Remove bold/italic
-        text = re.sub(r"\*\*([^*]+)\*\*", r"\1", text)
-        text = re.sub(r"\*([^*]+)\*", r"\1", text)
-        text = re.sub(r"__([^_]+)__", r"\1", text)
-        text = re.sub(r"_([^_]+)_", r"\1", text)
+        # Remove headers and horizontal rules (line-anchored, one pass)
+        text = _RE_LINE_MARKUP.sub("", text)
 
-        # Remove links but keep text
-        text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
-
-        # Remove images
-        text = re.sub(r"!\[([^\]]*)\]\([^)]+\)", r"", text)
-
-        # Remove horizontal rules
-        text = re.sub(r"^[-*_]{3,}$", "", text, flags=re.MULTILINE)
+        # Strip inline markup. One combined pass handles the common case;
+        # re-run for nested constructs (e.g. bold inside a link) until
+        # stable, capped to keep worst-case input bounded
+        for _ in range(3):
+            stripped = _RE_INLINE_MARKUP.sub(_inline_text, text)
+            if stripped == text:
+                break
+            text = stripped
 
         # Clean up extra whitespace
-        text = re.sub(r"\n{3,}", "\n\n", text)
+        text = _RE_EXTRA_NEWLINES.sub("\n\n", text)
 
         return text.strip()
 
     def _detect_definition_mime_type(self, entity: Entity, definition: str) -> str:
         """Detect the MIME type of an API definition."""
         # See: https://developers.glean.com/api-info/indexing/documents/supported-mimetypes
-        # All map to text/plain currently until types like JSON, YAML, etc are supported explicitly
-
-        # Check spec type hint first
-        spec_type = entity.spec.get("type", "").lower()
-
-        # Map spec types to MIME types
-        type_mapping = {
-            "openapi": "text/plain",  # Usually YAML
-            "asyncapi": "text/plain",
-            "graphql": "text/plain",
-            "grpc": "text/plain",  # Protocol buffers
-            "trpc": "text/plain",
-        }
-
-        if spec_type in type_mapping:
-            # Verify if it's JSON instead of YAML for openapi/asyncapi
-            if spec_type in ["openapi", "asyncapi"] and definition.strip().startswith("{"):
-                return "text/plain"
-            return type_mapping[spec_type]
-
-        # Try to detect from content
-        definition_lower = definition[:200].lower()
-
-        # Check for specific patterns
-        if "openapi:" in definition_lower or "swagger:" in definition_lower:
-            return "text/plain"
-        elif "asyncapi:" in definition_lower:
-            return "text/plain"
-        elif definition.strip().startswith("{") and "openapi" in definition_lower:
-            return "text/plain"
-        elif 'syntax = "proto' in definition_lower:
-            return "text/plain"  # Protocol buffers
-        elif "type Query" in definition or "type Mutation" in definition:
-            return "text/plain"
-        elif definition.strip().startswith("{"):
-            return "text/plain"
-        elif definition.strip().startswith("---") or ":" in definition[:50]:
-            return "text/plain"
-        else:
-            return "text/plain"
+        # Glean only accepts text/plain for definition bodies today, so
+        # skip content sniffing entirely; reinstate detection here once
+        # richer types (JSON, YAML, protobuf, GraphQL) are supported
+        return "text/plain"
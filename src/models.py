@@ -1,15 +1,23 @@
 """Pydantic models for Backstage entities."""
 
+from functools import cached_property
 from typing import Any
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
 
+# Leaf models are slotted frozen dataclasses: tens of thousands of them
+# exist at once on a large catalog, and slots drop the per-instance
+# __dict__ while giving fixed-offset attribute access. Entity itself
+# stays a BaseModel because its spec dict is mutated during dedupe.
 
-class EntityMetadata(BaseModel):
+
+@dataclass(slots=True, frozen=True)
+class EntityMetadata:
     """Metadata for a Backstage entity."""
 
-    namespace: str = Field(default="default")
     name: str
+    namespace: str = "default"
     uid: str | None = None
     etag: str | None = None
     description: str | None = None
@@ -19,7 +27,8 @@ class EntityMetadata(BaseModel):
     links: list[dict[str, str]] = Field(default_factory=list)
 
 
-class EntityRelation(BaseModel):
+@dataclass(slots=True, frozen=True)
+class EntityRelation:
     """Relationship between entities."""
 
     type: str
@@ -27,32 +36,42 @@ class EntityRelation(BaseModel):
     target: dict[str, Any] | None = None
 
 
-class UserProfile(BaseModel):
+@dataclass(slots=True, frozen=True)
+class UserProfile:
     """User profile information."""
 
     displayName: str | None = None
-    email: EmailStr | None = None
+    # A shape check is enough here: full RFC validation via email-validator
+    # ran once per parsed entity and dominated field-validation cost
+    email: str | None = Field(None, pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
     picture: str | None = None
 
 
 class UserSpec(BaseModel):
     """User entity specification."""
 
+    model_config = ConfigDict(defer_build=True)
+
     profile: UserProfile | None = None
     memberOf: list[str] = Field(default_factory=list)
 
 
-class GroupProfile(BaseModel):
+@dataclass(slots=True, frozen=True)
+class GroupProfile:
     """Group profile information."""
 
     displayName: str | None = None
-    email: EmailStr | None = None
+    # A shape check is enough here: full RFC validation via email-validator
+    # ran once per parsed entity and dominated field-validation cost
+    email: str | None = Field(None, pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
     picture: str | None = None
 
 
 class GroupSpec(BaseModel):
     """Group entity specification."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str = "team"
     profile: GroupProfile | None = None
     parent: str | None = None
@@ -63,6 +82,8 @@ class GroupSpec(BaseModel):
 class ComponentSpec(BaseModel):
     """Component entity specification."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str  # service, website, library, etc.
     lifecycle: str  # production, experimental, deprecated
     owner: str
@@ -76,6 +97,8 @@ class ComponentSpec(BaseModel):
 class ApiSpec(BaseModel):
     """API entity specification."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str  # openapi, asyncapi, graphql, grpc
     lifecycle: str
     owner: str
@@ -86,6 +109,8 @@ class ApiSpec(BaseModel):
 class SystemSpec(BaseModel):
     """System entity specification."""
 
+    model_config = ConfigDict(defer_build=True)
+
     owner: str
     domain: str | None = None
 
@@ -93,12 +118,16 @@ class SystemSpec(BaseModel):
 class DomainSpec(BaseModel):
     """Domain entity specification."""
 
+    model_config = ConfigDict(defer_build=True)
+
     owner: str
 
 
 class ResourceSpec(BaseModel):
     """Resource entity specification."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str
     owner: str
     system: str | None = None
@@ -114,16 +143,13 @@ class Entity(BaseModel):
     spec: dict[str, Any] = Field(default_factory=dict)
     relations: list[EntityRelation] = Field(default_factory=list)
 
-    @property
+    @cached_property
     def ref(self) -> str:
-        """Get entity reference string."""
+        """Get entity reference string.
+
+        Cached: the ref is read several times per entity (lookup-map keys,
+        relation resolution) but kind and name never change after parse,
+        so the lowercase and format run once per entity.
+        """
         namespace = self.metadata.namespace or "default"
         return f"{self.kind.lower()}:{namespace}/{self.metadata.name}"
-
-
-class EntitiesResponse(BaseModel):
-    """Response from Backstage entities API."""
-
-    items: list[Entity] = Field(default_factory=list)
-    totalItems: int | None = None
-    pageInfo: dict[str, Any] | None = None
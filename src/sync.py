@@ -1,5 +1,6 @@
 """Main sync orchestration logic."""
 
+import asyncio
 from datetime import datetime
 
 from rich.table import Table
@@ -10,7 +11,7 @@ from .config import Settings, get_settings
 from .glean_client import GleanClient
 from .logging import console, log_error, log_info, log_warning
 from .mapper import BackstageToGleanMapper
-from .utils import deduplicate_users_by_email
+from .utils import process_users
 
 
 class BackstageGleanSync:
@@ -95,8 +96,9 @@ class BackstageGleanSync:
             log_info("No users or groups to sync")
             return True
 
-        # Deduplicate users by email
-        unique_users, duplicates = deduplicate_users_by_email(users)
+        # Deduplicate users by email; the same pass inverts memberOf so
+        # the membership mapping below doesn't rescan the user list
+        unique_users, duplicates, members_by_group = process_users(users)
 
         if duplicates:
             log_info(f"Found {len(duplicates)} duplicate user emails, deduplicating...")
@@ -104,11 +106,14 @@ class BackstageGleanSync:
                 user_info = [f"{u.metadata.namespace}/{u.metadata.name}" for u in dup_users]
                 log_info(f"  Email {email} used by: {', '.join(user_info)}")
 
-        # Map to Glean format (using deduplicated users)
-        glean_users = [self.mapper.map_user_to_glean(user) for user in unique_users]
-        glean_groups = [self.mapper.map_group_to_glean(group) for group in groups]
-        # Pass deduplicated users for membership mapping
-        memberships = self.mapper.map_group_memberships(unique_users, groups)
+        # Map to Glean format (using deduplicated users); bind the mapper
+        # methods once rather than resolving them per element
+        map_user = self.mapper.map_user_to_glean
+        map_group = self.mapper.map_group_to_glean
+        glean_users = [map_user(user) for user in unique_users]
+        glean_groups = [map_group(group) for group in groups]
+        # Pass deduplicated users and the precomputed membership inversion
+        memberships = self.mapper.map_group_memberships(unique_users, groups, members_by_group)
 
         # Push to Glean
         success = True
@@ -131,10 +136,6 @@ class BackstageGleanSync:
         """Sync all other entities from Backstage to Glean."""
         log_info("Syncing catalog entities...")
 
-        # Fetch entities
-        all_entities = []
-        fetch_summary = {}
-
         entity_kinds = [
             kind for kind in self.settings.enabled_entity_kinds
             if kind not in ["User", "Group"]  # Already handled separately
@@ -142,72 +143,115 @@ class BackstageGleanSync:
 
         # Show fetch progress
         console.print("\n[bold]Fetching entities from Backstage:[/bold]")
-        fetch_table = Table(box=None)
-        fetch_table.add_column("Entity Type", style="cyan")
-        fetch_table.add_column("Count", justify="right", style="green")
 
-        for kind in entity_kinds:
-            entities = []
-            async for entity in self.backstage_client.fetch_entities(kind=kind):
-                entities.append(entity)
-                all_entities.append(entity)
-            fetch_summary[kind] = len(entities)
-            if len(entities) > 0:
-                fetch_table.add_row(f"{kind}s", str(len(entities)))
+        async def fetch_kind(kind: str) -> list:
+            return [entity async for entity in self.backstage_client.fetch_entities(kind=kind)]
 
-        console.print(fetch_table)
+        # Fetch every kind concurrently - each pagination is independent
+        # I/O on the shared connection pool, so total wall time is the
+        # slowest kind rather than the sum of all of them
+        results = await asyncio.gather(*(fetch_kind(kind) for kind in entity_kinds))
+
+        all_entities = []
+        fetch_summary = {}
+        fetch_rows = []
+        for kind, entities in zip(entity_kinds, results, strict=True):
+            n = len(entities)
+            fetch_summary[kind] = n
+            all_entities.extend(entities)
+            if n:
+                fetch_rows.append((f"{kind}s", str(n)))
+
+        # Only pay for rich's segment building when someone can see it;
+        # piped/cron output gets plain log lines instead
+        if console.is_terminal:
+            fetch_table = Table(box=None)
+            fetch_table.add_column("Entity Type", style="cyan")
+            fetch_table.add_column("Count", justify="right", style="green")
+            for row in fetch_rows:
+                fetch_table.add_row(*row)
+            console.print(fetch_table)
+        else:
+            for name, count in fetch_rows:
+                log_info(f"{name}: {count}")
 
         if not all_entities:
             log_info("No catalog entities to sync")
             return True
 
-        # Build entity lookup map for relationship resolution
-        entity_map = {}
-        for entity in all_entities:
-            # Store by full reference
-            entity_map[entity.ref] = entity
-            # Also store by name for easier lookup
-            entity_map[entity.metadata.name] = entity
-            # Store with namespace for unique identification
-            entity_map[f"{entity.metadata.namespace}/{entity.metadata.name}"] = entity
+        # Build entity lookup map for relationship resolution: each entity
+        # is reachable by full ref, bare name, and namespace/name. A single
+        # comprehension keeps the insert loop in C; later entities still
+        # win on key collisions, as before
+        entity_map = {
+            key: entity
+            for entity in all_entities
+            for key in (
+                entity.ref,
+                entity.metadata.name,
+                f"{entity.metadata.namespace}/{entity.metadata.name}",
+            )
+        }
 
         # Map to Glean documents
         console.print(f"\n[bold]Mapping {len(all_entities)} entities to Glean format...[/bold]")
-        documents = []
-        mapping_errors = []
+        mapping_errors: list[str] = []
+
+        # Local bindings keep the per-entity loop to LOAD_FAST lookups
+        # instead of attribute chains through self and the error list
+        map_entity_to_document = self.mapper.map_entity_to_document
+        errors_append = mapping_errors.append
 
-        for entity in all_entities:
+        def map_entity(entity):
             try:
-                doc = self.mapper.map_entity_to_document(entity, entity_map)
-                documents.append(doc)
+                return map_entity_to_document(entity, entity_map)
             except Exception as e:
-                mapping_errors.append(f"{entity.kind}:{entity.metadata.name} - {str(e)}")
+                errors_append(f"{entity.kind}:{entity.metadata.name} - {str(e)}")
+                return None
 
-        if mapping_errors:
-            console.print(f"\n[yellow]⚠️  Warning: {len(mapping_errors)} entities failed to map:[/yellow]")
-            for error in mapping_errors[:5]:  # Show first 5 errors
-                console.print(f"  - {error}")
-            if len(mapping_errors) > 5:
-                console.print(f"  ... and {len(mapping_errors) - 5} more")
-
-        # Push to Glean
         if self.settings.dry_run:
+            # Dry runs need the full list for sample output and JSON export
+            documents = [doc for doc in map(map_entity, all_entities) if doc is not None]
+            self._report_mapping_errors(mapping_errors)
             console.print(f"\n[bold]Would push {len(documents)} documents to Glean...[/bold]")
+            success = await self.glean_client.push_documents(documents)
+            doc_count = len(documents)
         else:
-            console.print(f"\n[bold]Pushing {len(documents)} documents to Glean...[/bold]")
-        success = await self.glean_client.push_documents(documents)
+            # Stream mapped documents straight into the uploader so batch
+            # uploads overlap with the mapping of later entities
+            async def mapped_documents():
+                for entity in all_entities:
+                    doc = map_entity(entity)
+                    if doc is not None:
+                        yield doc
+
+            console.print(f"\n[bold]Pushing {len(all_entities)} documents to Glean...[/bold]")
+            success = await self.glean_client.push_documents_stream(mapped_documents(), len(all_entities))
+            self._report_mapping_errors(mapping_errors)
+            doc_count = len(all_entities) - len(mapping_errors)
 
         # Show summary
         if success:
             if self.settings.dry_run:
-                console.print(f"[yellow]✅ Would push {len(documents)} documents[/yellow]")
+                console.print(f"[yellow]✅ Would push {doc_count} documents[/yellow]")
             else:
-                console.print(f"[green]✅ Successfully pushed {len(documents)} documents[/green]")
+                console.print(f"[green]✅ Successfully pushed {doc_count} documents[/green]")
         else:
             console.print("[red]❌ Failed to push some documents[/red]")
 
         return success
 
+    @staticmethod
+    def _report_mapping_errors(mapping_errors: list[str]) -> None:
+        """Print a truncated summary of entities that failed to map."""
+        if not mapping_errors:
+            return
+        console.print(f"\n[yellow]⚠️  Warning: {len(mapping_errors)} entities failed to map:[/yellow]")
+        for error in mapping_errors[:5]:  # Show first 5 errors
+            console.print(f"  - {error}")
+        if len(mapping_errors) > 5:
+            console.print(f"  ... and {len(mapping_errors) - 5} more")
+
     async def run_sync(self) -> bool:
         """Run the full sync process."""
         start_time = datetime.now()
@@ -260,6 +304,7 @@ class BackstageGleanSync:
 
         finally:
             # Cleanup
+            await self.backstage_client.close()
             await self.glean_client.close()
 
     async def run_dry_run(self) -> bool:
@@ -320,15 +365,20 @@ class BackstageGleanSync:
                 entity_counts["Users"] = len(users)
                 entity_counts["Groups"] = len(groups)
 
-                # Count other entities
-                other_entities = []
-                for kind in ["Component", "API", "System", "Domain", "Resource"]:
-                    if kind in self.settings.enabled_entity_kinds:
-                        count = 0
-                        async for _ in self.backstage_client.fetch_entities(kind=kind):
-                            count += 1
-                        entity_counts[f"{kind}s"] = count
-                        other_entities.extend([kind] * count)
+                # Count other entities without materializing them - the
+                # summary only needs the totals. Counts are independent
+                # requests, so issue them concurrently
+                kinds_to_count = [
+                    kind for kind in ["Component", "API", "System", "Domain", "Resource"]
+                    if kind in self.settings.enabled_entity_kinds
+                ]
+                counts = await asyncio.gather(
+                    *(self.backstage_client.count_entities(kind) for kind in kinds_to_count)
+                )
+                doc_count = 0
+                for kind, count in zip(kinds_to_count, counts, strict=True):
+                    entity_counts[f"{kind}s"] = count
+                    doc_count += count
             except Exception as e:
                 console.print(f"\n[red]Error fetching entities: {e}[/red]")
                 return False, {}
@@ -361,10 +411,9 @@ class BackstageGleanSync:
             details_table.add_row("Batch Size", str(self.settings.sync_batch_size))
             details_table.add_row("Total Entities", str(total_entities))
 
-            # Calculate estimated batches
-            doc_count = len(other_entities)
+            # Calculate estimated batches (ceiling division)
             if doc_count > 0:
-                estimated_batches = (doc_count + self.settings.sync_batch_size - 1) // self.settings.sync_batch_size
+                estimated_batches = -(-doc_count // self.settings.sync_batch_size)
                 details_table.add_row("Document Batches", str(estimated_batches))
 
             console.print(details_table)
@@ -1,34 +1,37 @@
 """Utility functions for Backstage data processing."""
 
+from functools import lru_cache
 from typing import Any
 
 
+@lru_cache(maxsize=16384)
 def parse_entity_ref(ref: str) -> tuple[str, str]:
     """Parse an entity reference into type and name.
 
+    Uses str.partition - one C-level scan per separator, no separate
+    membership test - and memoizes, since the same refs recur across
+    memberOf lists and entity relations.
+
     Examples:
         "user:default/john.doe" -> ("user", "john.doe")
         "group:default/team-a" -> ("group", "team-a")
         "team-a" -> ("", "team-a")
     """
-    if ":" in ref:
-        # Format: type:namespace/name or type:name
-        type_part, rest = ref.split(":", 1)
-        if "/" in rest:
-            # Has namespace
-            namespace, name = rest.split("/", 1)
-            return type_part, name
-        else:
-            # No namespace
-            return type_part, rest
-    else:
-        # Plain name
+    # Format: type:namespace/name, type:name, or plain name
+    entity_type, sep, rest = ref.partition(":")
+    if not sep:
         return "", ref
+    namespace, slash, name = rest.partition("/")
+    return entity_type, name if slash else namespace
 
 
+@lru_cache(maxsize=16384)
 def extract_name_from_ref(ref: str) -> str:
     """Extract just the name from an entity reference.
 
+    Memoized: the same refs (owners, systems, parents) repeat across
+    thousands of entities, so repeat lookups are a single cache hit.
+
     Examples:
         "user:default/john.doe" -> "john.doe"
         "group:default/team-a" -> "team-a"
@@ -56,7 +59,7 @@ def get_user_email(user_spec: dict[str, Any]) -> str:
     Returns:
         Email address (existing or generated)
     """
-    profile = user_spec.get("profile", {}) or {}
+    profile = user_spec.get("profile") or {}
     email = profile.get("email")
 
     if not email:
@@ -94,43 +97,68 @@ def build_members_by_group(users: list[Any]) -> dict[str, set[str]]:
     return members_by_group
 
 
-def deduplicate_users_by_email(users: list[Any]) -> tuple[list[Any], dict[str, list[Any]]]:
-    """Deduplicate users by email address.
+def process_users(users: list[Any]) -> tuple[list[Any], dict[str, list[Any]], dict[str, set[str]]]:
+    """Deduplicate users and invert group memberships in a single pass.
 
     When multiple users have the same email, the first one is kept and
-    group memberships are merged.
+    group memberships are merged. The same walk inverts memberOf into a
+    group -> member map, so the user list is only iterated once instead
+    of separately for deduplication and membership building.
 
     Args:
         users: List of user entities
 
     Returns:
-        Tuple of (deduplicated users, dict of email to duplicate users)
+        Tuple of (deduplicated users, dict of email to duplicate users,
+        dict of group name to member user names)
     """
-    seen_emails = {}
-    unique_users = []
-    duplicates = {}
+    first_by_email: dict[str, Any] = {}
+    merged_groups: dict[str, set[str]] = {}
+    duplicates: dict[str, list[Any]] = {}
+    members_by_group: dict[str, set[str]] = {}
 
     for user in users:
-        email = get_user_email(user.spec)
-
-        if email not in seen_emails:
-            # First time seeing this email
-            seen_emails[email] = user
-            unique_users.append(user)
-        else:
-            # Duplicate email - merge memberships
+        # One attribute read and one memberOf probe per user; the `or ()`
+        # also covers explicit null memberOf without a second branch
+        spec = user.spec
+        email = get_user_email(spec)
+        first = first_by_email.setdefault(email, user)
+        member_of = spec.get("memberOf") or ()
+
+        if first is not user:
+            # Duplicate email - record it and accumulate memberships so
+            # they can be merged into the first user after the loop
             if email not in duplicates:
-                duplicates[email] = [seen_emails[email]]
+                duplicates[email] = [first]
+                merged_groups[email] = set(first.spec.get("memberOf") or ())
             duplicates[email].append(user)
+            merged_groups[email].update(member_of)
+
+        # Memberships are attributed to the kept user's name so duplicate
+        # identities don't appear as extra members
+        member_name = first.metadata.name
+        for group_ref in member_of:
+            members_by_group.setdefault(extract_name_from_ref(group_ref), set()).add(member_name)
+
+    # Normalize each merged membership set exactly once, instead of
+    # rebuilding and renormalizing the union for every duplicate seen
+    for email, groups in merged_groups.items():
+        first_by_email[email].spec["memberOf"] = list({extract_name_from_ref(ref) for ref in groups})
 
-            # Merge memberOf into the first user
-            first_user = seen_emails[email]
-            first_member_of = set(first_user.spec.get("memberOf", []))
-            new_member_of = set(user.spec.get("memberOf", []))
+    return list(first_by_email.values()), duplicates, members_by_group
 
-            # Normalize and merge
-            all_groups = first_member_of | new_member_of
-            normalized_groups = list(set(normalize_member_refs(list(all_groups))))
-            first_user.spec["memberOf"] = normalized_groups
 
+def deduplicate_users_by_email(users: list[Any]) -> tuple[list[Any], dict[str, list[Any]]]:
+    """Deduplicate users by email address.
+
+    When multiple users have the same email, the first one is kept and
+    group memberships are merged.
+
+    Args:
+        users: List of user entities
+
+    Returns:
+        Tuple of (deduplicated users, dict of email to duplicate users)
+    """
+    unique_users, duplicates, _ = process_users(users)
     return unique_users, duplicates
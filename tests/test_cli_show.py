@@ -1,6 +1,6 @@
 """Tests for CLI show commands."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 from click.testing import CliRunner
@@ -9,7 +9,7 @@ from src.cli import show
 from src.models import Entity, EntityMetadata
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def runner():
     """Create a CLI test runner."""
     return CliRunner()
@@ -22,199 +22,210 @@ def mock_backstage_client():
     return client
 
 
-@pytest.fixture
-def sample_users():
-    """Create sample user entities."""
-    return [
-        Entity(
-            apiVersion="backstage.io/v1alpha1",
-            kind="User",
-            metadata=EntityMetadata(name="john.doe", namespace="default"),
-            spec={
-                "profile": {
-                    "displayName": "John Doe",
-                    "email": "john@example.com",
-                },
-                "memberOf": ["team-a", "team-b"],
-            },
-        ),
-        Entity(
-            apiVersion="backstage.io/v1alpha1",
-            kind="User",
-            metadata=EntityMetadata(name="jane.smith", namespace="default"),
-            spec={
-                "profile": {
-                    "displayName": "Jane Smith",
-                    "email": "jane@example.com",
-                },
-                "memberOf": ["team-c"],
+@pytest.fixture(autouse=True)
+def patched_cli(monkeypatch, mock_backstage_client):
+    """Install mocked settings and client into src.cli for every test.
+
+    monkeypatch.setattr does one setattr/restore per test instead of the
+    sys.modules walk that a nested mock.patch context pays on entry.
+    """
+    monkeypatch.setattr("src.cli.get_settings", MagicMock())
+    monkeypatch.setattr("src.cli.BackstageClient", MagicMock(return_value=mock_backstage_client))
+
+
+# Sample entities are built once at import with model_construct: the data
+# is known-good test input, so there is nothing for validation to catch,
+# and no test mutates them (the users have distinct emails, so the dedupe
+# merge path never rewrites their specs).
+_SAMPLE_USERS = [
+    Entity.model_construct(
+        apiVersion="backstage.io/v1alpha1",
+        kind="User",
+        metadata=EntityMetadata(name="john.doe", namespace="default"),
+        spec={
+            "profile": {
+                "displayName": "John Doe",
+                "email": "john@example.com",
             },
-        ),
-    ]
-
-
-@pytest.fixture
-def sample_groups():
-    """Create sample group entities."""
-    return [
-        Entity(
-            apiVersion="backstage.io/v1alpha1",
-            kind="Group",
-            metadata=EntityMetadata(name="team-a", namespace="default"),
-            spec={
-                "type": "team",
-                "profile": {"displayName": "Team A"},
-                "members": ["john.doe", "alice.wonder"],
-                "parent": "engineering",
-            },
-        ),
-        Entity(
-            apiVersion="backstage.io/v1alpha1",
-            kind="Group",
-            metadata=EntityMetadata(name="engineering", namespace="default"),
-            spec={
-                "type": "department",
-                "profile": {"displayName": "Engineering Department"},
-                "members": [],
-            },
-        ),
-    ]
-
-
-@pytest.fixture
-def sample_components():
-    """Create sample component entities."""
-    return [
-        Entity(
-            apiVersion="backstage.io/v1alpha1",
-            kind="Component",
-            metadata=EntityMetadata(
-                name="backend-service",
-                namespace="default",
-                description="Main backend service",
-            ),
-            spec={
-                "type": "service",
-                "lifecycle": "production",
-                "owner": "team-a",
-                "system": "main-system",
+            "memberOf": ["team-a", "team-b"],
+        },
+        relations=[],
+    ),
+    Entity.model_construct(
+        apiVersion="backstage.io/v1alpha1",
+        kind="User",
+        metadata=EntityMetadata(name="jane.smith", namespace="default"),
+        spec={
+            "profile": {
+                "displayName": "Jane Smith",
+                "email": "jane@example.com",
             },
+            "memberOf": ["team-c"],
+        },
+        relations=[],
+    ),
+]
+
+_SAMPLE_GROUPS = [
+    Entity.model_construct(
+        apiVersion="backstage.io/v1alpha1",
+        kind="Group",
+        metadata=EntityMetadata(name="team-a", namespace="default"),
+        spec={
+            "type": "team",
+            "profile": {"displayName": "Team A"},
+            "members": ["john.doe", "alice.wonder"],
+            "parent": "engineering",
+        },
+        relations=[],
+    ),
+    Entity.model_construct(
+        apiVersion="backstage.io/v1alpha1",
+        kind="Group",
+        metadata=EntityMetadata(name="engineering", namespace="default"),
+        spec={
+            "type": "department",
+            "profile": {"displayName": "Engineering Department"},
+            "members": [],
+        },
+        relations=[],
+    ),
+]
+
+_SAMPLE_COMPONENTS = [
+    Entity.model_construct(
+        apiVersion="backstage.io/v1alpha1",
+        kind="Component",
+        metadata=EntityMetadata(
+            name="backend-service",
+            namespace="default",
+            description="Main backend service",
         ),
-    ]
-
-
-def test_show_users_command(runner, mock_backstage_client, sample_users):
-    """Test the show users command."""
-    async def mock_fetch_entities(kind=None):
-        if kind == "User":
-            for user in sample_users:
-                yield user
+        spec={
+            "type": "service",
+            "lifecycle": "production",
+            "owner": "team-a",
+            "system": "main-system",
+        },
+        relations=[],
+    ),
+]
 
-    mock_backstage_client.fetch_entities = mock_fetch_entities
 
-    with patch("src.cli.get_settings") as mock_settings:
-        with patch("src.cli.BackstageClient") as mock_client_class:
-            mock_client_class.return_value = mock_backstage_client
+def make_fetcher(by_kind):
+    """Build a fetch_entities stub that yields from a kind -> entities map.
 
-            result = runner.invoke(show, ["users"])
+    One closure replaces the per-test async generator definitions; tests
+    just state which entities each kind should return.
+    """
+    async def fetch_entities(kind=None, limit=None):
+        for entity in by_kind.get(kind, ()):
+            yield entity
 
-            assert result.exit_code == 0
-            assert "john.doe" in result.output
-            assert "John Doe" in result.output
-            assert "john@example.com" in result.output
-            assert "team-a, team-b" in result.output
-            assert "jane.smith" in result.output
+    return fetch_entities
 
 
-def test_show_users_with_limit(runner, mock_backstage_client, sample_users):
-    """Test the show users command with limit."""
-    async def mock_fetch_entities(kind=None):
-        if kind == "User":
-            for user in sample_users[:1]:  # Only yield first user
-                yield user
-
-    mock_backstage_client.fetch_entities = mock_fetch_entities
-
-    with patch("src.cli.get_settings") as mock_settings:
-        with patch("src.cli.BackstageClient") as mock_client_class:
-            mock_client_class.return_value = mock_backstage_client
+@pytest.fixture(scope="session")
+def sample_users():
+    """Sample user entities."""
+    return _SAMPLE_USERS
 
-            result = runner.invoke(show, ["users", "--limit", "1"])
 
-            assert result.exit_code == 0
-            assert "john.doe" in result.output
-            assert "jane.smith" not in result.output  # Limited to 1
-            assert "showing 1 of 1 max" in result.output
+@pytest.fixture(scope="session")
+def sample_groups():
+    """Sample group entities."""
+    return _SAMPLE_GROUPS
 
 
-def test_show_groups_command(runner, mock_backstage_client, sample_groups):
-    """Test the show groups command."""
-    async def mock_fetch_entities(kind=None):
-        if kind == "Group":
-            for group in sample_groups:
-                yield group
+@pytest.fixture(scope="session")
+def sample_components():
+    """Sample component entities."""
+    return _SAMPLE_COMPONENTS
+
+
+@pytest.mark.parametrize(
+    ("command", "entity_kind", "fixture_name", "expected"),
+    [
+        (
+            "users",
+            "User",
+            "sample_users",
+            ["john.doe", "John Doe", "john@example.com", "team-a, team-b", "jane.smith"],
+        ),
+        (
+            "groups",
+            "Group",
+            "sample_groups",
+            ["team-a", "Team A", "engineering"],
+        ),
+        (
+            "components",
+            "Component",
+            "sample_components",
+            ["backend-service", "service", "production", "team-a", "main-system"],
+        ),
+    ],
+)
+def test_show_command(command, entity_kind, fixture_name, expected, request, capsys, mock_backstage_client):
+    """Test the show subcommands against their sample entities."""
+    entities = request.getfixturevalue(fixture_name)
+    mock_backstage_client.fetch_entities = make_fetcher({entity_kind: entities})
 
-    mock_backstage_client.fetch_entities = mock_fetch_entities
+    # Call the command callback directly - argument parsing is covered by
+    # the CliRunner smoke test below, and skipping the runner avoids its
+    # context push and stdout rebinding per case
+    kwargs = {"limit": 50}
+    if command == "groups":
+        kwargs["with_members"] = False
+    show.commands[command].callback(**kwargs)
 
-    with patch("src.cli.get_settings") as mock_settings:
-        with patch("src.cli.BackstageClient") as mock_client_class:
-            mock_client_class.return_value = mock_backstage_client
+    output = capsys.readouterr().out
+    for substring in expected:
+        assert substring in output
 
-            result = runner.invoke(show, ["groups"])
 
-            assert result.exit_code == 0
-            assert "team-a" in result.output
-            assert "Team A" in result.output
-            assert "engineering" in result.output
-            assert "2" in result.output  # Member count
+def test_show_groups_with_members(capsys, mock_backstage_client, sample_groups, sample_users):
+    """Test member counts when the groups command fetches users."""
+    mock_backstage_client.fetch_entities = make_fetcher({"Group": sample_groups, "User": sample_users})
 
+    show.commands["groups"].callback(limit=50, with_members=True)
 
-def test_show_components_command(runner, mock_backstage_client, sample_components):
-    """Test the show components command."""
-    async def mock_fetch_entities(kind=None):
-        if kind == "Component":
-            for component in sample_components:
-                yield component
+    lines = capsys.readouterr().out.splitlines()
+    # john is the only sample user in team-a; engineering has no members
+    team_a_row = next(line for line in lines if "team-a" in line)
+    assert " 1 " in team_a_row
+    engineering_row = next(line for line in lines if "department" in line)
+    assert " 0 " in engineering_row
 
-    mock_backstage_client.fetch_entities = mock_fetch_entities
 
-    with patch("src.cli.get_settings") as mock_settings:
-        with patch("src.cli.BackstageClient") as mock_client_class:
-            mock_client_class.return_value = mock_backstage_client
+def test_show_users_with_limit(runner, mock_backstage_client, sample_users):
+    """Test the show users command with limit."""
+    mock_backstage_client.fetch_entities = make_fetcher({"User": sample_users[:1]})
 
-            result = runner.invoke(show, ["components"])
+    result = runner.invoke(show, ["users", "--limit", "1"])
 
-            assert result.exit_code == 0
-            assert "backend-service" in result.output
-            assert "service" in result.output
-            assert "production" in result.output
-            assert "team-a" in result.output
-            assert "main-system" in result.output
+    assert result.exit_code == 0
+    assert "john.doe" in result.output
+    assert "jane.smith" not in result.output  # Limited to 1
+    assert "showing 1 users, 1 unique by email" in result.output
 
 
-def test_show_empty_results(runner, mock_backstage_client):
+def test_show_empty_results(capsys, mock_backstage_client):
     """Test show command with no results."""
-    async def mock_fetch_entities(kind=None):
-        return
-        yield  # Empty generator
-
-    mock_backstage_client.fetch_entities = mock_fetch_entities
-
-    with patch("src.cli.get_settings") as mock_settings:
-        with patch("src.cli.BackstageClient") as mock_client_class:
-            mock_client_class.return_value = mock_backstage_client
+    mock_backstage_client.fetch_entities = make_fetcher({})
 
-            result = runner.invoke(show, ["users"])
+    show.commands["users"].callback(limit=50)
 
-            assert result.exit_code == 0
-            assert "No users found in Backstage catalog" in result.output
+    assert "No users found in Backstage catalog" in capsys.readouterr().out
 
 
-def test_show_command_error_handling(runner):
+def test_show_command_error_handling(monkeypatch):
     """Test error handling in show commands."""
-    with patch("backstage_connector.cli.get_settings") as mock_settings:
-        mock_settings.side_effect = Exception("Configuration error")
+    monkeypatch.setattr("src.cli.get_settings", MagicMock(side_effect=Exception("Configuration error")))
 
-        result = runner.invoke(show, ["users"])
+    # Only the exit code matters here, so skip the runner's output
+    # capture and catch the sys.exit from the error handler directly
+    with pytest.raises(SystemExit) as excinfo:
+        show.commands["users"].callback(limit=50)
 
-        assert result.exit_code == 1
\ No newline at end of file
+    assert excinfo.value.code == 1
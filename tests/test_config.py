@@ -5,6 +5,20 @@ import pytest
 from src.config import Settings
 
 
+@pytest.fixture(scope="session")
+def default_settings():
+    """Settings built from only the required fields.
+
+    Session-scoped: the read-only tests below never mutate it, so one
+    construction (and one pydantic validation pass) serves them all.
+    """
+    return Settings(
+        backstage_base_url="https://backstage.example.com",
+        glean_instance_name="example",
+        glean_indexing_api_key="key",
+    )
+
+
 def test_settings_from_env(monkeypatch):
     """Test loading settings from environment variables."""
     # Set required environment variables
@@ -20,14 +34,9 @@ def test_settings_from_env(monkeypatch):
     assert settings.glean_datasource_id == "backstage"  # default value
 
 
-def test_settings_defaults():
+def test_settings_defaults(default_settings):
     """Test default values for optional settings."""
-    # Create settings with minimal required values
-    settings = Settings(
-        backstage_base_url="https://backstage.example.com",
-        glean_instance_name="example",
-        glean_indexing_api_key="key",
-    )
+    settings = default_settings
 
     # Check defaults
     assert settings.backstage_page_size == 100
@@ -39,19 +48,17 @@ def test_settings_defaults():
     assert settings.verify_ssl is True
 
 
-def test_enabled_entity_kinds():
+def test_enabled_entity_kinds(default_settings):
     """Test the enabled_entity_kinds property."""
-    settings = Settings(
-        backstage_base_url="https://backstage.example.com",
-        glean_instance_name="example",
-        glean_indexing_api_key="key",
-        sync_users_enabled=True,
-        sync_groups_enabled=True,
-        sync_components_enabled=True,
-        sync_apis_enabled=False,
-        sync_systems_enabled=False,
-        sync_domains_enabled=True,
-        sync_resources_enabled=False,
+    # model_copy skips validation and only rewrites the toggled fields;
+    # users/groups/components default to enabled already
+    settings = default_settings.model_copy(
+        update={
+            "sync_apis_enabled": False,
+            "sync_systems_enabled": False,
+            "sync_domains_enabled": True,
+            "sync_resources_enabled": False,
+        }
     )
 
     kinds = settings.enabled_entity_kinds
@@ -64,29 +71,22 @@ def test_enabled_entity_kinds():
     assert "Resource" not in kinds
 
 
-def test_settings_validation():
-    """Test settings validation."""
-    # Test invalid URL
-    with pytest.raises(ValueError):
-        Settings(
-            backstage_base_url="not-a-url",
-            glean_instance_name="example",
-            glean_indexing_api_key="key",
-        )
-
-    # Test page size validation
-    with pytest.raises(ValueError):
-        Settings(
-            backstage_base_url="https://backstage.example.com",
-            glean_instance_name="example",
-            glean_indexing_api_key="key",
-            backstage_page_size=0,  # Must be >= 1
-        )
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        pytest.param({"backstage_base_url": "not-a-url"}, id="invalid-url"),
+        pytest.param({"backstage_page_size": 0}, id="page-size-below-min"),
+        pytest.param({"backstage_page_size": 1001}, id="page-size-above-max"),
+    ],
+)
+def test_settings_validation(overrides):
+    """Test settings validation rejects out-of-range values."""
+    kwargs = {
+        "backstage_base_url": "https://backstage.example.com",
+        "glean_instance_name": "example",
+        "glean_indexing_api_key": "key",
+    }
+    kwargs.update(overrides)
 
     with pytest.raises(ValueError):
-        Settings(
-            backstage_base_url="https://backstage.example.com",
-            glean_instance_name="example",
-            glean_indexing_api_key="key",
-            backstage_page_size=1001,  # Must be <= 1000
-        )
+        Settings(**kwargs)
@@ -1,221 +1,300 @@
 """Tests for the data mapper module."""
 
-# Mock the Glean models before importing mapper
 import sys
+from functools import cache
+from types import SimpleNamespace
 from unittest.mock import MagicMock, Mock
 
 import pytest
 
-# Create a more comprehensive mock for the models module
+
+class _Factory:
+    """Plain callable stand-in for model classes no test asserts on.
+
+    A Mock records every call (args tuple, kwargs dict, call list entry);
+    for classes we only construct and never inspect, that bookkeeping is
+    pure overhead, so these are ordinary callables.
+    """
+
+    def __init__(self, make):
+        self._make = make
+
+    def __call__(self, **kwargs):
+        return self._make(**kwargs)
+
+    # The mapper builds these via model_construct; route it to the factory
+    model_construct = __call__
+
+
+# Only the classes whose calls tests assert on stay Mocks
 class MockModels:
     DatasourceUserDefinition = Mock(side_effect=lambda **kwargs: f"User({kwargs['user_id']})")
     DatasourceGroupDefinition = Mock(side_effect=lambda **kwargs: f"Group({kwargs['name']})")
-    DocumentDefinition = Mock(side_effect=lambda **kwargs: Mock(custom_metadata=None, **kwargs))
-    ContentDefinition = Mock(side_effect=lambda **kwargs: f"Content({kwargs.get('mime_type', 'text/plain')})")
-    PermissionsDefinition = Mock(side_effect=lambda **kwargs: Mock(allowed_users=None, **kwargs))
-    UserReferenceDefinition = Mock(side_effect=lambda **kwargs: f"UserRef({kwargs['datasource_user_id']})")
-    DatasourceBulkMembershipDefinition = Mock(side_effect=lambda **kwargs: f"BulkMembership({kwargs['group_name']})")
-    DatasourceMembershipDefinition = Mock(side_effect=lambda **kwargs: f"Membership({kwargs['user_id']})")
+    DocumentDefinition = Mock(side_effect=lambda **kwargs: SimpleNamespace(**kwargs))
+    DatasourceMembershipDefinition = Mock(side_effect=lambda **kwargs: f"Membership({kwargs['member_user_id']})")
+    ContentDefinition = _Factory(lambda **kwargs: f"Content({kwargs.get('mime_type', 'text/plain')})")
+    UserReferenceDefinition = _Factory(lambda **kwargs: f"UserRef({kwargs['datasource_user_id']})")
+    DocumentPermissionsDefinition = _Factory(lambda **kwargs: SimpleNamespace(**kwargs))
+    CustomProperty = _Factory(lambda **kwargs: SimpleNamespace(**kwargs))
+
+# model_construct calls must record on the same Mock the tests inspect
+MockModels.DocumentDefinition.model_construct = MockModels.DocumentDefinition
 
 mock_models = MockModels()
-sys.modules['glean'] = MagicMock()
-sys.modules['glean.api_client'] = MagicMock()
-sys.modules['glean.api_client'].models = mock_models
 
-from src.mapper import BackstageToGleanMapper  # noqa: E402
 from src.models import Entity, EntityMetadata  # noqa: E402
 
 
-@pytest.fixture
-def mapper():
-    """Create a mapper instance for testing."""
+@cache
+def _meta(name, namespace="default", etag=None):
+    """Cached EntityMetadata for the common name/namespace-only case.
+
+    EntityMetadata is frozen, so the same names across tests can safely
+    share one instance instead of reconstructing it. Entities fed through
+    the mapper get an etag: the mapper's cache key uses it directly and
+    otherwise falls back to serializing the whole entity.
+    """
+    return EntityMetadata(name=name, namespace=namespace, etag=etag)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _mock_glean():
+    """Install the mocked Glean SDK for the mapper import.
+
+    Module-scoped so the sys.modules entries are restored as soon as this
+    file finishes: no other test file imports the SDK today, and keeping
+    the patch window minimal means a future file (or a worker running
+    under pytest -n auto) never sees the mock by accident.
+    MonkeyPatch.context() restores the entries on teardown.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        api_client = MagicMock()
+        api_client.models = mock_models
+        mp.setitem(sys.modules, "glean", MagicMock())
+        mp.setitem(sys.modules, "glean.api_client", api_client)
+        yield
+
+
+@pytest.fixture(scope="module")
+def mapper(_mock_glean):
+    """Create a mapper instance shared by every test in this module.
+
+    The mapper is pure configuration (base URL + datasource id) and no
+    test mutates it, so one instance serves the whole module. Imported
+    lazily so the mocked SDK is in place first.
+    """
+    from src.mapper import BackstageToGleanMapper
+
     return BackstageToGleanMapper(
         backstage_base_url="https://backstage.example.com",
-        datasource_name="test-datasource",
+        datasource_id="test-datasource",
     )
 
 
-def test_map_user_to_glean(mapper):
-    """Test mapping a Backstage user to Glean format."""
-    user_entity = Entity(
-        apiVersion="backstage.io/v1alpha1",
-        kind="User",
-        metadata=EntityMetadata(
-            name="john.doe",
-            namespace="default",
-        ),
-        spec={
-            "profile": {
-                "displayName": "John Doe",
-                "email": "john.doe@example.com",
-                "picture": "https://example.com/john.jpg",
-            },
-            "memberOf": ["team-a", "team-b"],
+_USER_ENTITY = Entity(
+    apiVersion="backstage.io/v1alpha1",
+    kind="User",
+    metadata=_meta("john.doe", etag="v1"),
+    spec={
+        "profile": {
+            "displayName": "John Doe",
+            "email": "john.doe@example.com",
+            "picture": "https://example.com/john.jpg",
         },
-    )
+        "memberOf": ["team-a", "team-b"],
+    },
+)
 
-    result = mapper.map_user_to_glean(user_entity)
+_USER_WITHOUT_EMAIL = Entity(
+    apiVersion="backstage.io/v1alpha1",
+    kind="User",
+    metadata=_meta("jane.doe", etag="v1"),
+    spec={
+        "profile": {
+            "displayName": "Jane Doe",
+        },
+        "memberOf": [],
+    },
+)
 
-    # Verify the mock was called with correct arguments
-    mock_models.DatasourceUserDefinition.assert_called_once_with(
-        email="john.doe@example.com",
-        name="John Doe",
-        user_id="john.doe",
-        profile_url="https://backstage.example.com/catalog/default/user/john.doe",
-        photo_url="https://example.com/john.jpg",
-        datasource="test-datasource",
-    )
-    assert result == "User(john.doe)"
+_GROUP_ENTITY = Entity(
+    apiVersion="backstage.io/v1alpha1",
+    kind="Group",
+    metadata=_meta("team-a", etag="v1"),
+    spec={
+        "type": "team",
+        "profile": {
+            "displayName": "Team A",
+            "email": "team-a@example.com",
+        },
+    },
+)
+
+_COMPONENT_ENTITY = Entity(
+    apiVersion="backstage.io/v1alpha1",
+    kind="Component",
+    metadata=EntityMetadata(
+        name="backend-service",
+        namespace="default",
+        etag="v1",
+        description="Main backend service for the application",
+        tags=["backend", "python", "api"],
+        links=[
+            {"title": "Documentation", "url": "https://docs.example.com"},
+            {"title": "GitHub", "url": "https://github.com/example/backend"},
+        ],
+        annotations={
+            "github.com/project-slug": "example/backend",
+            "backstage.io/techdocs-ref": "dir:.",
+        },
+    ),
+    spec={
+        "type": "service",
+        "lifecycle": "production",
+        "owner": "team-a",
+        "system": "main-system",
+    },
+)
 
 
-def test_map_user_without_email(mapper):
-    """Test mapping a user without an email address."""
-    user_entity = Entity(
+# Built with model_construct: known-good input that no test mutates, so
+# the validation pass is skipped
+_MEMBERSHIP_USERS = [
+    Entity.model_construct(
         apiVersion="backstage.io/v1alpha1",
         kind="User",
-        metadata=EntityMetadata(
-            name="jane.doe",
-            namespace="default",
-        ),
-        spec={
-            "profile": {
-                "displayName": "Jane Doe",
-            },
-            "memberOf": [],
-        },
-    )
+        metadata=_meta("user1"),
+        spec={"memberOf": ["team-a", "team-b"]},
+        relations=[],
+    ),
+    Entity.model_construct(
+        apiVersion="backstage.io/v1alpha1",
+        kind="User",
+        metadata=_meta("user2"),
+        spec={"memberOf": ["team-a"]},
+        relations=[],
+    ),
+]
 
-    result = mapper.map_user_to_glean(user_entity)
+_MEMBERSHIP_GROUPS = [
+    Entity.model_construct(
+        apiVersion="backstage.io/v1alpha1",
+        kind="Group",
+        metadata=_meta("team-a"),
+        spec={},
+        relations=[],
+    ),
+    Entity.model_construct(
+        apiVersion="backstage.io/v1alpha1",
+        kind="Group",
+        metadata=_meta("team-b"),
+        spec={},
+        relations=[],
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def map_results(mapper):
+    """Run each single-entity mapping once and snapshot result plus call.
+
+    Module-scoped: the mapper is deterministic for a given entity, so the
+    per-test runs were repeating identical work. The recorded kwargs are
+    captured here because the per-test mock reset discards call history
+    before each test body runs.
+    """
+    def run(map_fn, entity, model_mock):
+        result = map_fn(entity)
+        return SimpleNamespace(result=result, call_kwargs=model_mock.call_args.kwargs)
+
+    return {
+        "user": run(mapper.map_user_to_glean, _USER_ENTITY, mock_models.DatasourceUserDefinition),
+        "user_without_email": run(mapper.map_user_to_glean, _USER_WITHOUT_EMAIL, mock_models.DatasourceUserDefinition),
+        "group": run(mapper.map_group_to_glean, _GROUP_ENTITY, mock_models.DatasourceGroupDefinition),
+        "component": run(mapper.map_entity_to_document, _COMPONENT_ENTITY, mock_models.DocumentDefinition),
+    }
+
+
+@pytest.fixture(autouse=True)
+def _reset_mock_models():
+    """Clear model-mock call history before each test.
+
+    Required now that the mapper (and its mock call history) outlives a
+    single test.
+    """
+    for value in vars(MockModels).values():
+        if isinstance(value, Mock):
+            value.reset_mock()
+
+
+def test_map_user_to_glean(map_results):
+    """Test mapping a Backstage user to Glean format."""
+    case = map_results["user"]
+
+    # Verify the mock was called with correct arguments
+    assert case.call_kwargs == {
+        "email": "john.doe@example.com",
+        "name": "John Doe",
+        "user_id": "john.doe",
+        "profile_url": "https://backstage.example.com/catalog/default/user/john.doe",
+        "photo_url": "https://example.com/john.jpg",
+        "datasource": "test-datasource",
+    }
+    assert case.result == "User(john.doe)"
+
+
+def test_map_user_without_email(map_results):
+    """Test mapping a user without an email address."""
+    case = map_results["user_without_email"]
 
     # Verify placeholder email was used
-    mock_models.DatasourceUserDefinition.assert_called_with(
-        email="jane.doe@backstage.local",
-        name="Jane Doe",
-        user_id="jane.doe",
-        profile_url="https://backstage.example.com/catalog/default/user/jane.doe",
-        photo_url=None,
-        datasource="test-datasource",
-    )
-    assert result == "User(jane.doe)"
+    assert case.call_kwargs == {
+        "email": "jane.doe@backstage.local",
+        "name": "Jane Doe",
+        "user_id": "jane.doe",
+        "profile_url": "https://backstage.example.com/catalog/default/user/jane.doe",
+        "photo_url": None,
+        "datasource": "test-datasource",
+    }
+    assert case.result == "User(jane.doe)"
 
 
-def test_map_group_to_glean(mapper):
+def test_map_group_to_glean(map_results):
     """Test mapping a Backstage group to Glean format."""
-    group_entity = Entity(
-        apiVersion="backstage.io/v1alpha1",
-        kind="Group",
-        metadata=EntityMetadata(
-            name="team-a",
-            namespace="default",
-        ),
-        spec={
-            "type": "team",
-            "profile": {
-                "displayName": "Team A",
-                "email": "team-a@example.com",
-            },
-        },
-    )
-
-    result = mapper.map_group_to_glean(group_entity)
+    case = map_results["group"]
 
-    mock_models.DatasourceGroupDefinition.assert_called_once_with(
-        name="team-a",
-        display_name="Team A",
-        datasource="test-datasource",
-    )
-    assert result == "Group(team-a)"
+    assert case.call_kwargs == {
+        "name": "team-a",
+        "display_name": "Team A",
+        "datasource": "test-datasource",
+    }
+    assert case.result == "Group(team-a)"
 
 
-def test_map_component_to_document(mapper):
+def test_map_component_to_document(map_results):
     """Test mapping a component entity to a Glean document."""
-    component_entity = Entity(
-        apiVersion="backstage.io/v1alpha1",
-        kind="Component",
-        metadata=EntityMetadata(
-            name="backend-service",
-            namespace="default",
-            description="Main backend service for the application",
-            tags=["backend", "python", "api"],
-            links=[
-                {"title": "Documentation", "url": "https://docs.example.com"},
-                {"title": "GitHub", "url": "https://github.com/example/backend"},
-            ],
-            annotations={
-                "github.com/project-slug": "example/backend",
-                "backstage.io/techdocs-ref": "dir:.",
-            },
-        ),
-        spec={
-            "type": "service",
-            "lifecycle": "production",
-            "owner": "team-a",
-            "system": "main-system",
-        },
-    )
-
-    result = mapper.map_entity_to_document(component_entity)
+    case = map_results["component"]
 
-    # Verify DocumentDefinition was called
-    assert mock_models.DocumentDefinition.called
-    
     # Check that the document was created with expected values
-    call_kwargs = mock_models.DocumentDefinition.call_args.kwargs
-    assert call_kwargs['title'] == "backend-service (Component)"
+    call_kwargs = case.call_kwargs
+    assert call_kwargs['title'] == "backend-service"
     assert call_kwargs['datasource'] == "test-datasource"
     assert call_kwargs['id'] == "component-default-backend-service"
-    assert call_kwargs['url'] == "https://backstage.example.com/catalog/default/component/backend-service"
-    
-    # Verify custom metadata was set on the mock document
-    assert result.custom_metadata == {
-        "entity_kind": "Component",
-        "entity_namespace": "default",
-        "entity_type": "service",
-        "entity_lifecycle": "production",
-        "entity_ref": "component:default/backend-service",
-        "tags": "backend,python,api",
+    assert call_kwargs['view_url'] == "https://backstage.example.com/catalog/default/component/backend-service"
+
+    # Verify entity metadata was attached as custom properties
+    assert {(prop.name, prop.value) for prop in case.result.custom_properties} == {
+        ("namespace", "default"),
+        ("kind", "service"),
+        ("lifecycle", "Production"),
+        ("ref", "component:default/backend-service"),
     }
+    assert case.result.tags == ["backend", "python", "api"]
 
 
 def test_map_group_memberships(mapper):
     """Test mapping user-group memberships."""
-    # Reset call counts
-    mock_models.DatasourceMembershipDefinition.reset_mock()
-    mock_models.DatasourceMembershipDefinition.reset_mock()
-    
-    users = [
-        Entity(
-            apiVersion="backstage.io/v1alpha1",
-            kind="User",
-            metadata=EntityMetadata(name="user1"),
-            spec={"memberOf": ["team-a", "team-b"]},
-        ),
-        Entity(
-            apiVersion="backstage.io/v1alpha1",
-            kind="User",
-            metadata=EntityMetadata(name="user2"),
-            spec={"memberOf": ["team-a"]},
-        ),
-    ]
-
-    groups = [
-        Entity(
-            apiVersion="backstage.io/v1alpha1",
-            kind="Group",
-            metadata=EntityMetadata(name="team-a"),
-            spec={},
-            relations=[],
-        ),
-        Entity(
-            apiVersion="backstage.io/v1alpha1",
-            kind="Group",
-            metadata=EntityMetadata(name="team-b"),
-            spec={},
-            relations=[],
-        ),
-    ]
-
-    result = mapper.map_group_memberships(users, groups)
+    result = mapper.map_group_memberships(_MEMBERSHIP_USERS, _MEMBERSHIP_GROUPS)
 
     # Should have created 3 membership definitions (one per user-group relationship)
     assert len(result) == 3
@@ -238,5 +317,5 @@ def test_map_group_memberships(mapper):
     )
     
     # Verify the results
-    assert "BulkMembership(team-a)" in result
-    assert "BulkMembership(team-b)" in result
\ No newline at end of file
+    assert "Membership(user1)" in result
+    assert "Membership(user2)" in result